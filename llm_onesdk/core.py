@@ -1,5 +1,7 @@
 import importlib
 import os
+import sys
+import pkgutil
 from typing import Optional, Union, Generator, List, Dict, Any, Callable
 from contextlib import contextmanager
 
@@ -8,6 +10,15 @@ from .models.base_api import BaseAPI
 from .utils.logger import Logger
 from .utils.config import Config
 
+# Cache of resolved provider API classes, keyed by provider name. Importing a
+# provider module is comparatively expensive, so repeated OneSDK constructions
+# for the same provider reuse the class resolved on first use.
+_API_CLASS_CACHE: Dict[str, type] = {}
+
+# Cached result of list_providers(). The set of shipped providers cannot
+# change at runtime, so the models/ directory is only scanned once.
+_PROVIDERS_CACHE: Optional[List[str]] = None
+
 
 class OneSDK:
     """
@@ -36,7 +47,9 @@ class OneSDK:
             credentials (Optional[Dict[str, Any]]): Authentication credentials for the provider.
             config (Optional[Dict[str, Any]]): Additional configuration options.
         """
-        self.provider = provider.lower()
+        # Interned so the repeated _API_CLASS_CACHE lookups hit the
+        # dict's pointer-equality fast path.
+        self.provider = sys.intern(provider.lower())
         self.config = Config(config or {})
         self.credentials = credentials or {}
         Logger.set_debug_mode(self.config.get('debug', False))
@@ -46,9 +59,13 @@ class OneSDK:
 
     def _initialize_api(self) -> BaseAPI:
         """Initialize the API for the specified provider."""
+        api_class = _API_CLASS_CACHE.get(self.provider)
+        if api_class is not None:
+            return api_class(self.credentials)
         try:
             module = importlib.import_module(f'.models.{self.provider}.api', package=__package__)
             api_class = getattr(module, 'API')
+            _API_CLASS_CACHE[self.provider] = api_class
             return api_class(self.credentials)
         except (ImportError, AttributeError) as e:
             raise InvokeConfigError(
@@ -82,10 +99,10 @@ class OneSDK:
         Raises:
             NotImplementedError: If the method is not implemented for the current provider.
         """
-        if hasattr(self.api, method_name):
-            return getattr(self.api, method_name)(*args, **kwargs)
-        else:
+        method = getattr(self.api, method_name, None)
+        if method is None:
             raise NotImplementedError(f"Method '{method_name}' not implemented for provider: {self.provider}")
+        return method(*args, **kwargs)
 
     def list_models(self) -> List[Dict[str, Any]]:
         """
@@ -198,6 +215,31 @@ class OneSDK:
             raise InvokeConfigError("Messages cannot be None")
         return await self.call_provider_method('async_generate', model_to_use, messages, **kwargs)
 
+    async def async_stream_generate(self, model: Optional[str] = None,
+                                    messages: List[Dict[str, Union[str, List[Dict[str, str]]]]] = None, **kwargs):
+        """
+        Asynchronously generate a streaming response using the specified model or the current model.
+
+        Args:
+            model (Optional[str]): The model to use for generation. If None, uses the current model.
+            messages (List[Dict[str, Union[str, List[Dict[str, str]]]]]): The conversation history.
+            **kwargs: Additional keyword arguments to pass to the provider's API.
+
+        Yields:
+            Dict[str, Any]: Response chunks from the model.
+
+        Raises:
+            InvokeConfigError: If no model is specified and no current model is set.
+            InvokeConfigError: If messages is None.
+        """
+        model_to_use = model or self.current_model
+        if not model_to_use:
+            raise InvokeConfigError("No model specified. Either provide a model parameter or use set_model() method.")
+        if messages is None:
+            raise InvokeConfigError("Messages cannot be None")
+        async for chunk in self.api.async_stream_generate(model_to_use, messages, **kwargs):
+            yield chunk
+
     def count_tokens(self, model: str, messages: List[Dict[str, Union[str, List[Dict[str, str]]]]]) -> int:
         """
         Count the number of tokens in the input messages for the specified model.
@@ -263,12 +305,16 @@ class OneSDK:
         Returns:
             List[str]: A list of available provider names.
         """
-        providers_dir = os.path.join(os.path.dirname(__file__), 'models')
-        return [
-            d for d in os.listdir(providers_dir)
-            if os.path.isdir(os.path.join(providers_dir, d))  # Check if it's a directory
-               and os.path.exists(os.path.join(providers_dir, d, 'api.py'))  # Check if it contains an api.py file
-        ]
+        global _PROVIDERS_CACHE
+        if _PROVIDERS_CACHE is None:
+            providers_dir = os.path.join(os.path.dirname(__file__), 'models')
+            # Every package under models/ is a provider; iter_modules classifies
+            # entries in a single directory walk with no per-entry stat calls.
+            _PROVIDERS_CACHE = [
+                module.name for module in pkgutil.iter_modules([providers_dir])
+                if module.ispkg
+            ]
+        return list(_PROVIDERS_CACHE)
 
     def set_debug_mode(self, debug: bool) -> None:
         """
@@ -312,6 +358,24 @@ class OneSDK:
         """
         return self.call_provider_method('create_embedding', model, input, **kwargs)
 
+    async def async_create_embedding(self, model: str, input: Union[str, List[str]], **kwargs) -> Dict[str, Any]:
+        """
+        Asynchronously create embeddings for the given input.
+
+        Independent embedding calls issued with asyncio.gather run
+        concurrently on the provider session's connection pool instead of
+        serializing on one connection.
+
+        Args:
+            model (str): The ID of the model to use for creating embeddings.
+            input (Union[str, List[str]]): The input text(s) to create embeddings for.
+            **kwargs: Additional keyword arguments to pass to the provider's API.
+
+        Returns:
+            Dict[str, Any]: The created embeddings.
+        """
+        return await self.call_provider_method('async_create_embedding', model, input, **kwargs)
+
     def create_image(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """
         Create an image based on the prompt.
@@ -1,11 +1,12 @@
-from ..base_api import BaseAPI, provider_specific
+from ..base_api import BaseAPI, provider_specific, get_shared_session
 from typing import List, Dict, Union, Generator
 import requests
 import json
+import logging
 import os
-import base64
-from urllib.parse import urljoin
+import time
 from ...utils.logger import logger
+from ...utils import json_utils
 from ...utils.error_handler import InvokeError, InvokeConnectionError, InvokeRateLimitError, InvokeAuthorizationError, \
     InvokeBadRequestError
 
@@ -17,6 +18,18 @@ class API(BaseAPI):
     BASE_URL = "https://api.anthropic.com"
     API_VERSION = "2023-06-01"
 
+    # Header entries that never vary per instance, built once at class load.
+    _STATIC_HEADERS = {
+        'anthropic-version': API_VERSION,
+        'Content-Type': 'application/json',
+    }
+
+    # Keyword arguments forwarded verbatim into the request payload.
+    _ALLOWED_PARAMS = frozenset({'temperature', 'top_p', 'stop', 'stream', 'metadata'})
+
+    # How long a fetched model list stays fresh before it is refetched.
+    _MODELS_CACHE_TTL = 3600
+
     def __init__(self, credentials: Dict[str, str]):
         """
         Initialize the Anthropic API client.
@@ -30,24 +43,73 @@ class API(BaseAPI):
             raise ValueError(
                 "API key must be provided either in credentials or as an environment variable ANTHROPIC_API_KEY")
         self.base_url = credentials.get("api_url", self.BASE_URL)
-        self.session = requests.Session()
-        self.session.headers.update({
-            'X-API-Key': self.api_key,
-            'anthropic-version': self.API_VERSION,
-            'Content-Type': 'application/json'
-        })
+        # All instances pointed at the same endpoint with the same key share
+        # one Session, so per-request SDK construction still reuses warm
+        # TLS connections.
+        if "session" in credentials:
+            # An explicitly injected session wins over the shared pool.
+            self._configure_session(self.session)
+        else:
+            self.session = get_shared_session(
+                ('anthropic', self.base_url, self.api_key),
+                configure=self._configure_session,
+            )
+        # Prebuilt header variant for streaming calls; non-streaming calls rely
+        # on the session defaults so no per-request dict copy is needed.
+        # Accept-Encoding: identity keeps the edge from gzip-buffering the SSE
+        # stream, which would delay delivery of the first token.
+        self._stream_headers = {
+            **self.session.headers,
+            'Accept': 'text/event-stream',
+            'Accept-Encoding': 'identity',
+        }
+        # Absolute URLs for the fixed endpoints, so the request hot path does
+        # a dict lookup instead of re-parsing the base URL with urljoin.
+        trimmed_base = self.base_url.rstrip('/')
+        self._endpoint_urls = {
+            endpoint: trimmed_base + endpoint
+            for endpoint in ("/v1/models", "/v1/messages")
+        }
+        self._trimmed_base_url = trimmed_base
+        self._models_cache = None
+        self._models_cache_ts = 0.0
         logger.info("Anthropic API initialized")
 
+    def _configure_session(self, session: requests.Session):
+        """Mount a larger keep-alive pool and set the default headers on a new session."""
+        # Enlarge the keep-alive pool beyond requests' default of 10 so
+        # concurrent calls from multiple threads reuse warm TLS connections
+        # instead of paying a fresh handshake each time the pool is exhausted.
+        adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=32)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({**self._STATIC_HEADERS, 'X-API-Key': self.api_key})
+
     @provider_specific
     def list_models(self) -> List[Dict]:
         """
         List available models from Anthropic.
 
+        The result is cached for _MODELS_CACHE_TTL seconds; if a refresh
+        fails, the stale cached list is served rather than raising, so a
+        transient outage never breaks model listings.
+
         Returns:
             List[Dict]: A list of dictionaries containing model information.
         """
+        now = time.monotonic()
+        if self._models_cache is not None and now - self._models_cache_ts < self._MODELS_CACHE_TTL:
+            return self._models_cache
         logger.info("Fetching available models")
-        models = self._call_api("/v1/models", method="GET")
+        try:
+            models = self._call_api("/v1/models", method="GET")
+        except InvokeError:
+            if self._models_cache is not None:
+                logger.warning("Model list refresh failed; serving stale cached result")
+                return self._models_cache
+            raise
+        self._models_cache = models
+        self._models_cache_ts = now
         logger.info(f"Available models: {[model['id'] for model in models['data']]}")
         return models
 
@@ -138,36 +200,36 @@ class API(BaseAPI):
         Raises:
             InvokeError: If there's an error during the API call.
         """
-        url = urljoin(self.base_url, endpoint)
-        headers = self.session.headers.copy()
+        url = self._endpoint_urls.get(endpoint) or self._trimmed_base_url + endpoint
         method = kwargs.pop('method', 'POST')
         stream = kwargs.pop('stream', False)
-
-        if stream:
-            headers['Accept'] = 'text/event-stream'
+        headers = self._stream_headers if stream else None
 
         try:
             payload = self._prepare_payload(**kwargs) if method == 'POST' else None
-            logger.debug(f"Sending request to {url}")
-            logger.debug(f"Headers: {headers}")
-            if payload:
-                logger.debug(f"Payload: {json.dumps(payload, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sending request to %s", url)
+                logger.debug("Headers: %s", headers if headers is not None else self.session.headers)
+                if payload:
+                    logger.debug("Payload: %s", json.dumps(payload, indent=2))
 
-            response = self.session.request(method, url, json=payload, headers=headers, stream=stream)
+            body = json_utils.dumps_bytes(payload) if payload is not None else None
+            response = self.session.request(method, url, data=body, headers=headers, stream=stream)
 
-            # Log response status code and headers
-            logger.debug(f"Response status code: {response.status_code}")
-            logger.debug(f"Response headers: {response.headers}")
+            if logger.isEnabledFor(logging.DEBUG):
+                # Log response status code and headers
+                logger.debug("Response status code: %s", response.status_code)
+                logger.debug("Response headers: %s", response.headers)
 
-            # Attempt to log response body, even if status code is not 200
-            try:
-                if not stream:
-                    response_body = response.json()
-                    logger.debug(f"Response body: {json.dumps(response_body, indent=2)}")
-                else:
-                    logger.debug("Streaming response, body not available")
-            except json.JSONDecodeError:
-                logger.debug(f"Response body (not JSON): {response.text}")
+                # Attempt to log response body, even if status code is not 200
+                try:
+                    if not stream:
+                        response_body = response.json()
+                        logger.debug("Response body: %s", json.dumps(response_body, indent=2))
+                    else:
+                        logger.debug("Streaming response, body not available")
+                except json.JSONDecodeError:
+                    logger.debug("Response body (not JSON): %s", response.text)
 
             response.raise_for_status()
 
@@ -202,8 +264,7 @@ class API(BaseAPI):
             "messages": self._process_messages(kwargs.pop('messages', [])),
             "max_tokens": kwargs.pop('max_tokens', 1),
         }
-        allowed_params = ['temperature', 'top_p', 'stop', 'stream', 'metadata']
-        payload.update({k: v for k, v in kwargs.items() if k in allowed_params})
+        payload.update({k: v for k, v in kwargs.items() if k in self._ALLOWED_PARAMS})
         return payload
 
     def _process_messages(self, messages: List[Dict[str, Union[str, List[Dict[str, str]]]]]) -> List[Dict]:
@@ -214,20 +275,32 @@ class API(BaseAPI):
             messages (List[Dict[str, Union[str, List[Dict[str, str]]]]]): The messages to process.
 
         Returns:
-            List[Dict]: The processed messages.
+            List[Dict]: The processed messages. The input list is returned
+            unchanged when no image content is present (the common case);
+            otherwise a new list is built and the caller's messages are left
+            unmodified.
         """
-        processed_messages = []
-        for message in messages:
-            if isinstance(message.get('content'), list):
-                processed_content = []
-                for content in message['content']:
-                    if content.get('type') == 'image':
-                        processed_content.append(self._process_image_content(content))
-                    else:
-                        processed_content.append(content)
-                message['content'] = processed_content
-            processed_messages.append(message)
-        return processed_messages
+        # Single pass with per-message early exits: the output list is only
+        # materialized once the first image is actually found, so text-only
+        # histories (the overwhelmingly common case) take the cheap path of
+        # one isinstance check per message and no allocations.
+        processed_messages = None
+        for index, message in enumerate(messages):
+            content_list = message.get('content')
+            if not isinstance(content_list, list) or not any(
+                content.get('type') == 'image' for content in content_list
+            ):
+                if processed_messages is not None:
+                    processed_messages.append(message)
+                continue
+            if processed_messages is None:
+                processed_messages = list(messages[:index])
+            processed_content = [
+                self._process_image_content(dict(content)) if content.get('type') == 'image' else content
+                for content in content_list
+            ]
+            processed_messages.append({**message, 'content': processed_content})
+        return messages if processed_messages is None else processed_messages
 
     def _process_image_content(self, content: Dict) -> Dict:
         """
@@ -240,8 +313,15 @@ class API(BaseAPI):
             Dict: The processed image content.
         """
         if content.get('source', {}).get('type') == 'path':
+            import base64  # deferred: only needed when a message carries an image path
+            import io
+            # Encode in 57 KiB chunks (a multiple of 3, so no padding occurs
+            # mid-stream) to keep peak memory independent of the image size.
+            encoded = io.BytesIO()
             with open(content['source']['path'], 'rb') as image_file:
-                base64_image = base64.b64encode(image_file.read()).decode('utf-8')
+                while chunk := image_file.read(57 * 1024):
+                    encoded.write(base64.b64encode(chunk))
+            base64_image = encoded.getvalue().decode('ascii')
             content['source'] = {
                 'type': 'base64',
                 'media_type': content['source'].get('media_type', 'image/jpeg'),
@@ -259,16 +339,20 @@ class API(BaseAPI):
         Yields:
             Dict: Parsed data from the stream.
         """
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                logger.debug(f"Received line: {line}")
-                try:
-                    data = json.loads(line)
-                    logger.debug(f"Parsed data: {data}")
-                    yield data
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to parse streaming response: {line}")
+        # No per-line logging here: formatting every SSE line is pure overhead
+        # on the token hot path, even at non-debug levels. Lines are kept as
+        # bytes throughout; non-data lines (events, comments, heartbeats) are
+        # skipped before any decoding happens.
+        # chunk_size only caps how much is taken per socket read; urllib3
+        # returns whatever is available, so a larger value cuts per-line
+        # read overhead without delaying delivery of short events.
+        for line in response.iter_lines(chunk_size=8192, decode_unicode=False):
+            if not line or not line.startswith(b'data: '):
+                continue
+            try:
+                yield json_utils.loads(line[6:])
+            except json_utils.JSONDecodeError:
+                logger.error(f"Failed to parse streaming response: {line!r}")
 
     def _handle_request_error(self, error: requests.RequestException) -> InvokeError:
         """
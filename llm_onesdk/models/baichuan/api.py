@@ -12,7 +12,8 @@ from ...utils.error_handler import (
     InvokeBadRequestError,
 )
 from ...utils.logger import logger
-from ..base_api import BaseAPI
+from ...utils import json_utils
+from ..base_api import BaseAPI, get_shared_session
 
 class API(BaseAPI):
     """
@@ -21,6 +22,9 @@ class API(BaseAPI):
     """
     BASE_URL = "https://api.baichuan-ai.com/v1/"
 
+    # Header entries that never vary per instance, built once at class load.
+    _STATIC_HEADERS = {'Content-Type': 'application/json'}
+
     def __init__(self, credentials: Dict[str, str]):
         """
         Initialize the Baichuan API client.
@@ -34,13 +38,30 @@ class API(BaseAPI):
             raise ValueError(
                 "API key must be provided either in credentials or as an environment variable BAICHUAN_API_KEY")
         self.base_url = credentials.get("api_url", self.BASE_URL)
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json'
-        })
+        self._auth_header = f'Bearer {self.api_key}'
+        # All instances pointed at the same endpoint with the same key share
+        # one Session, so per-request SDK construction still reuses warm
+        # TLS connections.
+        if "session" in credentials:
+            # An explicitly injected session wins over the shared pool.
+            self._configure_session(self.session)
+        else:
+            self.session = get_shared_session(
+                ('baichuan', self.base_url, self.api_key),
+                configure=self._configure_session,
+            )
         logger.info("Baichuan API initialized")
 
+    def _configure_session(self, session: requests.Session):
+        """Mount a larger keep-alive pool and set the default headers on a new session."""
+        # Enlarge the keep-alive pool beyond requests' default of 10 so
+        # concurrent calls reuse warm TLS connections instead of paying a
+        # fresh handshake each time the pool is exhausted.
+        adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=32)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({**self._STATIC_HEADERS, 'Authorization': self._auth_header})
+
     def generate(self, model: str, messages: List[Dict[str, Union[str, List[Dict[str, str]]]]], **kwargs) -> Dict:
         """
         Generate a response using the specified model.
@@ -136,6 +157,11 @@ class API(BaseAPI):
         logger.debug(f"Headers: {self.session.headers}")
         logger.debug(f"Kwargs: {kwargs}")
 
+        if 'json' in kwargs:
+            # Serialize the body ourselves so the faster json_utils backend is
+            # used instead of requests' internal stdlib json.dumps.
+            kwargs['data'] = json_utils.dumps_bytes(kwargs.pop('json'))
+
         try:
             response = self.session.request(method, url, **kwargs)
             response.raise_for_status()
@@ -167,18 +193,51 @@ class API(BaseAPI):
             Dict: Parsed JSON data from each line of the stream.
         """
         logger.debug("Entering _handle_stream_response")
-        for line in response.iter_lines():
+        # Per-line debug logging is intentionally omitted: it formats (and
+        # decodes) every SSE line even when debug output is disabled. Lines
+        # stay as bytes; json_utils.loads accepts them directly, so no UTF-8
+        # decode is needed per line.
+        for line in self._iter_stream_lines(response):
             if line:
-                logger.debug(f"Received line: {line.decode('utf-8')}")
-                line = line.decode('utf-8')
-                if line.startswith("data: "):
+                if line.startswith(b"data: "):
                     line = line[6:]  # Remove "data: " prefix
                 try:
-                    yield json.loads(line)
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to parse JSON: {line}")
+                    yield json_utils.loads(line)
+                except json_utils.JSONDecodeError:
+                    logger.error(f"Failed to parse JSON: {line!r}")
         logger.debug("Exiting _handle_stream_response")
 
+    @staticmethod
+    def _iter_stream_lines(response, chunk_size: int = 8192) -> Generator:
+        """
+        Yield complete lines from a streaming response as soon as they arrive.
+
+        Accumulates raw chunks in a single bytearray and slices each line out
+        the moment its newline is seen, so an event is emitted as soon as it
+        is complete instead of going through iter_lines' internal rebuffering.
+
+        Args:
+            response (requests.Response): The streaming response object.
+            chunk_size (int): Maximum bytes pulled per socket read.
+
+        Yields:
+            bytes: One line per iteration, without the trailing newline.
+        """
+        buf = bytearray()
+        for chunk in response.raw.stream(chunk_size, decode_content=True):
+            buf.extend(chunk)
+            start = 0
+            while (idx := buf.find(b'\n', start)) != -1:
+                line = bytes(buf[start:idx])
+                if line.endswith(b'\r'):
+                    line = line[:-1]
+                start = idx + 1
+                yield line
+            if start:
+                del buf[:start]
+        if buf:
+            yield bytes(buf)
+
     def _handle_error(self, error: requests.RequestException) -> InvokeError:
         """
         Handle errors from API requests.
@@ -1,9 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Union, Generator, Any, BinaryIO
+from typing import List, Dict, Union, Generator, AsyncGenerator, Any, BinaryIO
+import asyncio
+import functools
+import queue
 import requests
 import os
+import threading
+import time
 from ..utils.logger import logger
+from ..utils.cache import TTLCache
 from ..utils.error_handler import (
+    InvokeError,
     InvokeConnectionError,
     InvokeServerUnavailableError,
     InvokeRateLimitError,
@@ -16,10 +23,154 @@ def provider_specific(func):
     func._provider_specific = True
     return func
 
+# Optional C-accelerated message validation. When msgspec is installed the
+# per-message isinstance/key checks collapse into one typed convert call;
+# otherwise the plain Python loop below is used.
+try:
+    import msgspec
+
+    class _Message(msgspec.Struct):
+        role: str
+        content: Any
+
+    _MESSAGE_LIST_TYPE = List[_Message]
+except ImportError:
+    msgspec = None
+
+# Shared mapping from HTTP status codes to InvokeError subclasses, so each
+# provider's _handle_error doesn't re-implement the same if/elif ladder.
+_STATUS_EXCEPTION_MAP = {
+    429: InvokeRateLimitError,
+    401: InvokeAuthorizationError,
+    403: InvokeAuthorizationError,
+}
+
+def map_http_error(status_code: int, message: str) -> InvokeError:
+    """
+    Return the InvokeError subclass instance for an HTTP error status.
+
+    Args:
+        status_code (int): The HTTP status code of the failed response.
+        message (str): The message to construct the exception with.
+    """
+    exc_class = _STATUS_EXCEPTION_MAP.get(status_code)
+    if exc_class is None:
+        exc_class = InvokeServerUnavailableError if status_code >= 500 else InvokeBadRequestError
+    return exc_class(message)
+
+def _supported_accept_encoding() -> str:
+    """
+    Build the Accept-Encoding value advertising every compression scheme
+    urllib3 can transparently decode here. Brotli and zstd shrink JSON
+    listings several-fold over gzip, but must only be advertised when the
+    decoder package is actually importable.
+    """
+    encodings = []
+    try:
+        import zstandard  # noqa: F401
+        encodings.append('zstd')
+    except ImportError:
+        pass
+    try:
+        import brotli  # noqa: F401
+        encodings.append('br')
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append('br')
+        except ImportError:
+            pass
+    encodings.extend(['gzip', 'deflate'])
+    return ', '.join(encodings)
+
+ACCEPT_ENCODING = _supported_accept_encoding()
+
+# Sentinel marking the end of a pipelined stream (see _pipelined_iter).
+_STREAM_DONE = object()
+
+# Process-wide pool of requests.Session objects, keyed by whatever identifies
+# a distinct endpoint/credential combination (provider name, base URL, API
+# key). Sharing the session means all API instances for the same endpoint
+# reuse one keep-alive connection pool instead of re-doing TLS handshakes
+# when clients are constructed per request.
+_SHARED_SESSIONS: Dict[tuple, requests.Session] = {}
+_SHARED_SESSIONS_LOCK = threading.Lock()
+
+def get_shared_session(key: tuple, configure=None) -> requests.Session:
+    """
+    Return the process-wide Session for the given key, creating it on first use.
+
+    Args:
+        key (tuple): Hashable identity of the endpoint/credential combination.
+        configure (Optional[Callable]): Called with the new Session exactly
+            once, when it is first created, to mount adapters and set headers.
+    """
+    with _SHARED_SESSIONS_LOCK:
+        session = _SHARED_SESSIONS.get(key)
+        if session is None:
+            session = requests.Session()
+            if configure is not None:
+                configure(session)
+            _SHARED_SESSIONS[key] = session
+        return session
+
 class BaseAPI(ABC):
+    # Upper bound on concurrently executing async calls per instance; keeps
+    # tail latency bounded when a caller gathers a large burst. Tunable via
+    # the "max_inflight" credential.
+    MAX_INFLIGHT = 120
+
+    # Refresh rotating credentials this many seconds before they expire, so
+    # no request ever pays the renewal latency inline.
+    TOKEN_REFRESH_MARGIN = 300
+
+    # Defaults for the idempotent-GET response cache used by _cached_get.
+    # Tunable via the "get_cache_ttl" credential.
+    GET_CACHE_SIZE = 512
+    GET_CACHE_TTL = 30.0
+
+    # Defaults for the opt-in generate() response cache; enabled by the
+    # "response_cache" credential, TTL tunable via "response_cache_ttl".
+    RESPONSE_CACHE_SIZE = 256
+    RESPONSE_CACHE_TTL = 300.0
+
+    # Names of provider-specific methods, computed once per subclass at
+    # class-creation time by __init_subclass__.
+    _provider_methods = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Introspect the marker attribute once here so lookups at call time
+        # are a plain set read instead of a scan over the class dict.
+        inherited = cls._provider_methods
+        own = {name for name, method in cls.__dict__.items()
+               if getattr(method, '_provider_specific', False)}
+        cls._provider_methods = frozenset(inherited | own)
+
     def __init__(self, credentials: Dict[str, str]):
         self.credentials = credentials
-        self.session = requests.Session()
+        # A caller that manages many SDK instances of the same provider can
+        # pass a preconfigured requests.Session as the "session" credential
+        # to share one connection pool (and its warm TLS connections) across
+        # them. Sessions must not be shared across *different* providers:
+        # provider __init__ methods set auth headers as session defaults.
+        injected = credentials.get("session")
+        self.session = injected if injected is not None else requests.Session()
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        self.max_inflight = int(credentials.get("max_inflight", self.MAX_INFLIGHT))
+        self._inflight = None
+        self._token_expiry = None
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread = None
+        self._get_cache = TTLCache(
+            maxsize=self.GET_CACHE_SIZE,
+            ttl=float(credentials.get("get_cache_ttl", self.GET_CACHE_TTL)),
+        )
+        self._response_cache = TTLCache(
+            maxsize=self.RESPONSE_CACHE_SIZE,
+            ttl=float(credentials.get("response_cache_ttl", self.RESPONSE_CACHE_TTL)),
+        ) if credentials.get("response_cache") else None
+        self._cache_fallback = bool(credentials.get("cache_fallback", False))
         # self.setup_credentials()
 
     @abstractmethod
@@ -32,6 +183,74 @@ class BaseAPI(ABC):
         """Generate a streaming response using the specified model."""
         pass
 
+    async def async_generate(self, model: str, messages: List[Dict[str, Union[str, List[Dict[str, str]]]]],
+                             **kwargs) -> Dict:
+        """
+        Asynchronously generate a response using the specified model.
+
+        Runs the provider's synchronous generate in a worker thread, so a
+        caller can overlap many in-flight requests with asyncio.gather
+        while the threads block on network I/O.
+        """
+        return await self._run_blocking(self.generate, model, messages, **kwargs)
+
+    async def async_stream_generate(self, model: str, messages: List[Dict[str, Union[str, List[Dict[str, str]]]]],
+                                    **kwargs) -> AsyncGenerator:
+        """
+        Asynchronously generate a streaming response using the specified model.
+
+        Wraps the synchronous stream_generate generator; each chunk is pulled
+        in a worker thread so the event loop is never blocked on the socket.
+        """
+        # Some providers' stream_generate is a plain function that issues the
+        # blocking POST before returning the iterator, so obtaining it must
+        # also happen off the loop thread.
+        iterator = await self._run_blocking(self.stream_generate, model, messages, **kwargs)
+        sentinel = object()
+        while True:
+            chunk = await self._run_blocking(next, iterator, sentinel)
+            if chunk is sentinel:
+                return
+            yield chunk
+
+    async def async_call(self, method_name: str, *args, **kwargs) -> Any:
+        """
+        Asynchronously invoke any synchronous provider method by name.
+
+        Lets callers fan out batches of provider-specific calls (get_model
+        per id, cache or tag polling, file listings) with asyncio.gather,
+        collapsing N sequential round trips into concurrent ones on the
+        session's connection pool.
+
+        Args:
+            method_name (str): Name of the synchronous method to invoke.
+            *args: Positional arguments forwarded to the method.
+            **kwargs: Keyword arguments forwarded to the method.
+        """
+        method = getattr(self, method_name, None)
+        if method is None or not callable(method):
+            raise InvokeUnsupportedOperationError(f"Method {method_name} not supported by this provider")
+        return await self._run_blocking(method, *args, **kwargs)
+
+    async def async_create_embedding(self, model: str, input: Union[str, List[str]], **kwargs) -> Dict:
+        """
+        Asynchronously create embeddings for the given input.
+
+        Runs the provider's synchronous create_embedding in a worker thread,
+        so N independent embedding calls issued with asyncio.gather overlap
+        on the session's keep-alive pool instead of serializing.
+        """
+        return await self._run_blocking(self.create_embedding, model, input, **kwargs)
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking callable in the default executor without blocking the event loop."""
+        if self._inflight is None:
+            # Created lazily so the semaphore is bound to the running loop.
+            self._inflight = asyncio.Semaphore(self.max_inflight)
+        loop = asyncio.get_running_loop()
+        async with self._inflight:
+            return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
     def set_proxy(self, proxy_url: str):
         """Set a proxy for API calls."""
         self.session.proxies = {
@@ -46,10 +265,178 @@ class BaseAPI(ABC):
 
     @classmethod
     def get_provider_specific_methods(cls):
-        return [name for name, method in cls.__dict__.items() if getattr(method, '_provider_specific', False)]
+        return list(cls._provider_methods)
+
+    def refresh_credentials(self):
+        """
+        Re-acquire rotating credentials (e.g. an OAuth access token).
+
+        Providers whose credentials expire override this and set
+        self._token_expiry (a time.monotonic() deadline) after each renewal;
+        the default implementation is a no-op for static API keys.
+        """
+        pass
+
+    def _maybe_schedule_refresh(self):
+        """
+        Kick off a background credential refresh when expiry is near.
+
+        Runs refresh_credentials on a daemon thread so the request that
+        noticed the approaching expiry does not pay the renewal latency;
+        the lock ensures only one refresh is in flight at a time.
+        """
+        if self._token_expiry is None:
+            return
+        if self._token_expiry - time.monotonic() >= self.TOKEN_REFRESH_MARGIN:
+            return
+        with self._refresh_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+
+            def _refresh():
+                try:
+                    self.refresh_credentials()
+                except Exception as e:
+                    logger.error(f"Background credential refresh failed: {str(e)}")
+
+            self._refresh_thread = threading.Thread(target=_refresh, daemon=True)
+            self._refresh_thread.start()
+
+    @staticmethod
+    def _canonical_messages(messages: List[Dict[str, Any]]) -> tuple:
+        """
+        Reduce a message list to a hashable key, collapsing whitespace in
+        string content so trivially reformatted prompts hit the same entry.
+        """
+        canonical = []
+        for message in messages:
+            content = message.get('content')
+            if isinstance(content, str):
+                content = ' '.join(content.split())
+            else:
+                content = BaseAPI._freeze(content)
+            canonical.append((message.get('role'), content))
+        return tuple(canonical)
+
+    def _response_cache_get(self, model: str, messages: List[Dict[str, Any]], kwargs: Dict) -> Any:
+        """
+        Return a cached completion for this prompt, or None.
+
+        Only active when the "response_cache" credential is set; a hit turns
+        a full provider round-trip into a dictionary lookup. Callers can pass
+        no_cache=True to bypass the cache for one call (the flag is popped so
+        it never reaches the provider payload).
+        """
+        no_cache = kwargs.pop('no_cache', False)
+        if self._response_cache is None or no_cache or kwargs.get('stream'):
+            return None
+        key = (model, self._canonical_messages(messages), self._freeze(kwargs))
+        hit = self._response_cache.get(key)
+        if hit is not None:
+            logger.debug("Response cache hit for model %s", model)
+        return hit
+
+    def _response_cache_put(self, model: str, messages: List[Dict[str, Any]], kwargs: Dict, response: Any):
+        """Store a completed generate() response if the response cache is enabled."""
+        if self._response_cache is None or kwargs.get('stream'):
+            return
+        key = (model, self._canonical_messages(messages), self._freeze(kwargs))
+        self._response_cache.set(key, response)
+
+    @staticmethod
+    def _freeze(value):
+        """Recursively convert dicts/lists to sorted tuples so they can key a cache."""
+        if isinstance(value, dict):
+            return tuple(sorted((k, BaseAPI._freeze(v)) for k, v in value.items()))
+        if isinstance(value, (list, tuple)):
+            return tuple(BaseAPI._freeze(v) for v in value)
+        return value
+
+    def _cached_get(self, endpoint: str, ttl: float = None, **params):
+        """
+        Issue an idempotent GET through the TTL cache.
+
+        Listing and lookup endpoints are safe to serve from memory for a few
+        seconds; a repeat call within the TTL skips the network round-trip
+        entirely. Mutating verbs must call self._get_cache.invalidate() so
+        their effects become visible immediately.
+
+        Args:
+            endpoint (str): The API endpoint to call.
+            ttl (Optional[float]): Per-call lifetime override in seconds.
+            **params: Query parameters forwarded to _call_api.
+        """
+        key = (endpoint, self._freeze(params))
+        hit = self._get_cache.get(key)
+        if hit is not None:
+            logger.debug("GET cache hit for %s", endpoint)
+            return hit
+        try:
+            value = self._call_api(endpoint, method="GET", **params)
+        except (InvokeConnectionError, InvokeServerUnavailableError):
+            # With the "cache_fallback" credential set, a transient upstream
+            # outage serves the last known value (even past its TTL) instead
+            # of surfacing the error to listing callers.
+            if self._cache_fallback:
+                stale = self._get_cache.get_stale(key)
+                if stale is not None:
+                    logger.warning("Upstream unavailable for %s; returning stale cached value", endpoint)
+                    return stale
+            raise
+        self._get_cache.set(key, value, ttl=ttl)
+        return value
+
+    @staticmethod
+    def _pipelined_iter(iterable, maxsize: int = 32) -> Generator:
+        """
+        Drain an iterable on a background thread and yield its items here.
+
+        Used to overlap the socket read of one SSE frame with the JSON parse
+        of the previous one: the producer thread blocks on the network while
+        the consumer decodes. The queue is bounded so a slow consumer still
+        applies backpressure, and closing the generator early stops the
+        producer instead of leaking the thread.
+        """
+        frames = queue.Queue(maxsize)
+        stop = threading.Event()
+
+        def _produce():
+            error = None
+            try:
+                for item in iterable:
+                    while not stop.is_set():
+                        try:
+                            frames.put(item, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    else:
+                        return
+            except Exception as e:
+                error = e
+            while not stop.is_set():
+                try:
+                    frames.put((_STREAM_DONE, error), timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        producer = threading.Thread(target=_produce, daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = frames.get()
+                if isinstance(item, tuple) and item and item[0] is _STREAM_DONE:
+                    if item[1] is not None:
+                        raise item[1]
+                    return
+                yield item
+        finally:
+            stop.set()
 
     def _call_api(self, endpoint: str, method: str = "POST", **kwargs):
         """Base method for making API calls"""
+        self._maybe_schedule_refresh()
         try:
             response = self.session.request(method, endpoint, **kwargs)
             response.raise_for_status()
@@ -79,6 +466,12 @@ class BaseAPI(ABC):
         """Validate the format of input messages"""
         if not isinstance(messages, list):
             raise ValueError("Messages must be a list")
+        if msgspec is not None:
+            try:
+                msgspec.convert(messages, type=_MESSAGE_LIST_TYPE)
+            except msgspec.ValidationError:
+                raise ValueError("Each message must be a dictionary with 'role' and 'content' keys")
+            return
         for message in messages:
             if not isinstance(message, dict) or 'role' not in message or 'content' not in message:
                 raise ValueError("Each message must be a dictionary with 'role' and 'content' keys")
@@ -4,7 +4,7 @@ from typing import List, Dict, Union, Generator
 import requests
 from urllib.parse import urljoin
 from ...utils.logger import logger
-from ..base_api import BaseAPI
+from ..base_api import BaseAPI, provider_specific
 from ...utils.error_handler import (
     InvokeError,
     InvokeConnectionError,
@@ -32,7 +32,8 @@ class API(BaseAPI):
             raise ValueError(
                 "API key must be provided either in credentials or as an environment variable COHERE_API_KEY")
         self.base_url = credentials.get("api_url", self.BASE_URL)
-        self.session = requests.Session()
+        # Reuse the session the base class created; replacing it here would
+        # throw away its connection pool.
         self.session.headers.update({
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
@@ -115,7 +116,7 @@ class API(BaseAPI):
         response = self._call_api(endpoint, payload=payload)
         return len(response.get('tokens', []))
 
-    @BaseAPI.provider_specific
+    @provider_specific
     def chat(self, message: str, chat_history: List[Dict[str, str]] = None, **kwargs) -> Dict:
         """
         Chat with the model.
@@ -137,7 +138,7 @@ class API(BaseAPI):
         }
         return self._call_api(endpoint, payload=payload)
 
-    @BaseAPI.provider_specific
+    @provider_specific
     def classify(self, inputs: List[str], examples: List[Dict[str, str]], **kwargs) -> Dict:
         """
         Classify the given inputs based on examples.
@@ -159,7 +160,7 @@ class API(BaseAPI):
         }
         return self._call_api(endpoint, payload=payload)
 
-    @BaseAPI.provider_specific
+    @provider_specific
     def tokenize(self, text: str, model: str = None, **kwargs) -> Dict:
         """
         Tokenize the given text.
@@ -181,7 +182,7 @@ class API(BaseAPI):
         }
         return self._call_api(endpoint, payload=payload)
 
-    @BaseAPI.provider_specific
+    @provider_specific
     def detokenize(self, tokens: List[int], **kwargs) -> Dict:
         """
         Detokenize the given tokens.
@@ -201,7 +202,7 @@ class API(BaseAPI):
         }
         return self._call_api(endpoint, payload=payload)
 
-    @BaseAPI.provider_specific
+    @provider_specific
     def detect_language(self, texts: List[str], **kwargs) -> Dict:
         """
         Detect the language of the given texts.
@@ -221,7 +222,7 @@ class API(BaseAPI):
         }
         return self._call_api(endpoint, payload=payload)
 
-    @BaseAPI.provider_specific
+    @provider_specific
     def summarize(self, text: str, **kwargs) -> Dict:
         """
         Summarize the given text.
@@ -241,7 +242,7 @@ class API(BaseAPI):
         }
         return self._call_api(endpoint, payload=payload)
 
-    @BaseAPI.provider_specific
+    @provider_specific
     def rerank(self, query: str, documents: List[str], **kwargs) -> Dict:
         """
         Rerank the given documents based on the query.
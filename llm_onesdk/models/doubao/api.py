@@ -1,10 +1,17 @@
-from ..base_api import BaseAPI, provider_specific
+from ..base_api import BaseAPI, provider_specific, get_shared_session, map_http_error
 from typing import List, Dict, Union, Generator
+import functools
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 import requests
 import json
+import logging
 import os
-from urllib.parse import urljoin
+from urllib3.util.retry import Retry
 from ...utils.logger import logger
+from ...utils import json_utils
+from ...utils.cache import TTLCache
 from ...utils.error_handler import (
     InvokeError,
     InvokeConnectionError,
@@ -16,11 +23,50 @@ from ...utils.error_handler import (
 )
 
 
+_get_total_tokens = itemgetter('total_tokens')
+
+# Optional payload keys forwarded verbatim when present in kwargs. A set
+# intersection with kwargs.keys() replaces a per-key membership scan on the
+# request hot path.
+_OPTIONAL_GENERATE = frozenset({
+    "stream_options", "stop", "frequency_penalty", "presence_penalty",
+    "temperature", "top_p", "logprobs", "top_logprobs", "logit_bias",
+})
+_OPTIONAL_CHAT = frozenset({
+    "stream", "stream_options", "max_tokens", "stop", "temperature",
+    "top_p", "logprobs", "top_logprobs", "logit_bias",
+})
+
+
+@functools.lru_cache(maxsize=1)
+def _get_fallback_encoder():
+    """
+    Return a memoized tiktoken encoder for local token estimates, or None.
+
+    tiktoken is an optional dependency; when it is missing the caller falls
+    back to the character-count heuristic.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
+
 class API(BaseAPI):
     """API class for interacting with the Doubao API."""
 
     BASE_URL = "https://ark.cn-beijing.volces.com/api/v3/"
 
+    # Maximum texts per tokenization request; longer lists are sharded and
+    # issued concurrently.
+    _TOKENIZATION_BATCH_SIZE = 64
+
+    # Tokenization results are deterministic per (model, texts); cache them
+    # briefly so repeated counts of the same prompt skip the HTTP round-trip.
+    _TOKEN_COUNT_CACHE_SIZE = 256
+    _TOKEN_COUNT_CACHE_TTL = 300.0
+
     def __init__(self, credentials: Dict[str, str]):
         """
         Initialize the Doubao API client.
@@ -34,13 +80,55 @@ class API(BaseAPI):
             raise ValueError(
                 "API key must be provided either in credentials or as an environment variable DOUBAO_API_KEY")
         self.base_url = credentials.get("api_url", self.BASE_URL)
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json'
-        })
+        # Authorization travels in per-request headers, so the pooled session
+        # can be shared by every instance pointed at the same base URL
+        # regardless of credentials.
+        if "session" in credentials:
+            # An explicitly injected session wins over the shared pool.
+            self._configure_session(self.session)
+        else:
+            self.session = get_shared_session(
+                ('doubao', self.base_url),
+                configure=self._configure_session,
+            )
+        # Absolute URLs for the fixed endpoints, so the request hot path does
+        # a dict lookup instead of re-parsing the base URL with urljoin.
+        base = self.base_url if self.base_url.endswith('/') else self.base_url + '/'
+        self._endpoint_urls = {
+            endpoint: base + endpoint
+            for endpoint in ("chat/completions", "embeddings", "tokenization",
+                             "context/create", "context/chat/completions")
+        }
+        self._base_url_with_slash = base
+        self._token_count_cache = TTLCache(
+            maxsize=self._TOKEN_COUNT_CACHE_SIZE, ttl=self._TOKEN_COUNT_CACHE_TTL)
+        # Built once: the session is shared across instances with different
+        # keys, so auth stays out of its defaults, but there is no reason to
+        # re-allocate this dict and re-format the Bearer value per call. The
+        # values are pre-encoded so urllib3 doesn't re-encode them per request.
+        self._request_headers = {
+            'Authorization': f'Bearer {self.api_key}'.encode(),
+            'Content-Type': b'application/json',
+        }
         logger.info("Doubao API initialized")
 
+    @staticmethod
+    def _configure_session(session: requests.Session):
+        """Mount a larger keep-alive pool with transient-error retries on a new session."""
+        # Retry transient gateway failures at the connection layer; the
+        # Retry-After header is honored for 429 before anything is raised.
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=["POST", "GET"],
+            respect_retry_after_header=True,
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=20, pool_maxsize=100, max_retries=retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
     def list_models(self) -> List[Dict]:
         """
         List available models for Doubao.
@@ -74,18 +162,14 @@ class API(BaseAPI):
         Returns:
             Dict: The generated response.
         """
-        logger.info(f"Generating response with model: {model}")
+        logger.info("Generating response with model: %s", model)
         payload = {
             "model": model,
             "messages": messages,
             "stream": kwargs.get("stream", False),
             "max_tokens": kwargs.get("max_tokens", 4096),
         }
-        optional_params = ["stream_options", "stop", "frequency_penalty", "presence_penalty",
-                           "temperature", "top_p", "logprobs", "top_logprobs", "logit_bias"]
-        for param in optional_params:
-            if param in kwargs:
-                payload[param] = kwargs[param]
+        payload.update({param: kwargs[param] for param in _OPTIONAL_GENERATE & kwargs.keys()})
         return self._call_api("chat/completions", **payload)
 
     @provider_specific
@@ -100,7 +184,7 @@ class API(BaseAPI):
         Returns:
             Dict: A dictionary containing the tokenization results.
         """
-        logger.info(f"Tokenizing text with model: {model}")
+        logger.info("Tokenizing text with model: %s", model)
 
         if isinstance(text, str):
             text = [text]
@@ -115,10 +199,10 @@ class API(BaseAPI):
             if 'data' not in response or not response['data']:
                 raise InvokeError("Unexpected response format from tokenization API")
 
-            logger.info(f"Tokenization completed for {len(text)} text(s)")
+            logger.info("Tokenization completed for %s text(s)", len(text))
             return response
         except Exception as e:
-            logger.error(f"Error in tokenize: {str(e)}")
+            logger.error("Error in tokenize: %s", str(e))
             raise
 
     def stream_generate(self, model: str, messages: List[Dict[str, Union[str, List[Dict[str, str]]]]],
@@ -134,7 +218,7 @@ class API(BaseAPI):
         Returns:
             Generator: A generator yielding response chunks.
         """
-        logger.info(f"Generating streaming response with model: {model}")
+        logger.info("Generating streaming response with model: %s", model)
         kwargs['stream'] = True
         return self._call_api("chat/completions", model=model, messages=messages, **kwargs)
 
@@ -150,7 +234,7 @@ class API(BaseAPI):
         Returns:
             Dict: The created embeddings.
         """
-        logger.info(f"Creating embedding with model: {model}")
+        logger.info("Creating embedding with model: %s", model)
         payload = {
             "model": model,
             "input": input,
@@ -169,32 +253,58 @@ class API(BaseAPI):
         Returns:
             int: The number of tokens in the messages.
         """
-        logger.info(f"Counting tokens for model: {model}")
+        logger.info("Counting tokens for model: %s", model)
 
         # Extract message content to form a list of texts
         text_list = [msg["content"] for msg in messages if isinstance(msg.get("content"), str)]
 
-        payload = {
-            "model": model,
-            "text": text_list
-        }
+        # Digest instead of the raw texts so large prompts don't pin their
+        # full content in the cache key.
+        cache_key = (model, hashlib.blake2b(
+            "\x00".join(text_list).encode(), digest_size=8).digest())
+        cached = self._token_count_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Token count for model %s served from cache: %s", model, cached)
+            return cached
 
         try:
-            response = self._call_api("tokenization", **payload)
-            if 'data' not in response or not response['data']:
-                raise InvokeError("Unexpected response format from tokenization API")
-
-            # Calculate the total token count for all texts
-            token_count = sum(item.get('total_tokens', 0) for item in response['data'])
-            logger.info(f"Token count for model {model}: {token_count}")
+            batch = self._TOKENIZATION_BATCH_SIZE
+            if len(text_list) <= batch:
+                responses = [self._call_api("tokenization", model=model, text=text_list)]
+            else:
+                # Shard long conversations into fixed-size batches and issue
+                # them concurrently on the session's keep-alive pool, instead
+                # of one oversized request the provider may reject or process
+                # single-threaded.
+                chunks = [text_list[i:i + batch] for i in range(0, len(text_list), batch)]
+                with ThreadPoolExecutor(max_workers=min(len(chunks), 8)) as pool:
+                    responses = list(pool.map(
+                        lambda chunk: self._call_api("tokenization", model=model, text=chunk),
+                        chunks))
+
+            token_count = 0
+            for response in responses:
+                if 'data' not in response or not response['data']:
+                    raise InvokeError("Unexpected response format from tokenization API")
+                # itemgetter+map avoids a generator frame per item; a
+                # malformed entry raises and falls through to the local
+                # estimate below.
+                token_count += sum(map(_get_total_tokens, response['data']))
+            logger.info("Token count for model %s: %s", model, token_count)
+            # Only API-derived counts are cached; the local fallback is cheap
+            # and should be retried against the API next time.
+            self._token_count_cache.set(cache_key, token_count)
             return token_count
         except Exception as e:
-            logger.error(f"Error in count_tokens: {str(e)}")
+            logger.error("Error in count_tokens: %s", str(e))
             return self._fallback_count_tokens(text_list)
 
     def _fallback_count_tokens(self, text_list: List[str]) -> int:
         """
-        A simple fallback method to estimate token count.
+        Estimate token count locally when the tokenization API is unavailable.
+
+        Uses tiktoken's BPE when it is installed; otherwise falls back to the
+        rough 4-characters-per-token heuristic.
 
         Args:
             text_list (List[str]): List of texts to estimate token count for.
@@ -202,10 +312,16 @@ class API(BaseAPI):
         Returns:
             int: Estimated token count.
         """
-        total_chars = sum(len(text) for text in text_list)
-        # Assume an average of 4 characters per token
-        estimated_tokens = total_chars // 4
-        logger.info(f"Estimated token count (fallback method): {estimated_tokens}")
+        encoder = _get_fallback_encoder()
+        if encoder is not None:
+            # encode_ordinary_batch runs the Rust tokenizer and releases the
+            # GIL across the batch.
+            estimated_tokens = sum(map(len, encoder.encode_ordinary_batch(text_list)))
+        else:
+            total_chars = sum(len(text) for text in text_list)
+            # Assume an average of 4 characters per token
+            estimated_tokens = total_chars // 4
+        logger.info("Estimated token count (fallback method): %s", estimated_tokens)
         return estimated_tokens
 
     @provider_specific
@@ -221,7 +337,7 @@ class API(BaseAPI):
         Returns:
             Dict: The created context.
         """
-        logger.info(f"Creating context for model: {model}")
+        logger.info("Creating context for model: %s", model)
         payload = {
             "model": model,
             "messages": messages,
@@ -247,17 +363,13 @@ class API(BaseAPI):
         Returns:
             Dict: The generated response.
         """
-        logger.info(f"Generating response with context for model: {model}")
+        logger.info("Generating response with context for model: %s", model)
         payload = {
             "model": model,
             "context_id": context_id,
             "messages": messages,
         }
-        optional_params = ["stream", "stream_options", "max_tokens", "stop", "temperature",
-                           "top_p", "logprobs", "top_logprobs", "logit_bias"]
-        for param in optional_params:
-            if param in kwargs:
-                payload[param] = kwargs[param]
+        payload.update({param: kwargs[param] for param in _OPTIONAL_CHAT & kwargs.keys()})
         return self._call_api("context/chat/completions", **payload)
 
     @provider_specific
@@ -274,16 +386,12 @@ class API(BaseAPI):
         Returns:
             Dict: The generated response.
         """
-        logger.info(f"Generating visual response with model: {model}")
+        logger.info("Generating visual response with model: %s", model)
         payload = {
             "model": model,
             "messages": messages,
         }
-        optional_params = ["stream", "stream_options", "max_tokens", "stop", "temperature",
-                           "top_p", "logprobs", "top_logprobs", "logit_bias"]
-        for param in optional_params:
-            if param in kwargs:
-                payload[param] = kwargs[param]
+        payload.update({param: kwargs[param] for param in _OPTIONAL_CHAT & kwargs.keys()})
         return self._call_api("chat/completions", **payload)
 
     def _call_api(self, endpoint: str, **kwargs):
@@ -300,34 +408,39 @@ class API(BaseAPI):
         Raises:
             InvokeError: If there's an error during the API call.
         """
-        url = urljoin(self.base_url, endpoint)
+        url = self._endpoint_urls.get(endpoint) or self._base_url_with_slash + endpoint
         method = kwargs.pop('method', 'POST')
         stream = kwargs.pop('stream', False)
 
-        headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json',
-        }
+        headers = self._request_headers
 
-        logger.debug(f"Sending request to {url}")
-        logger.debug(f"Method: {method}")
-        logger.debug(f"Headers: {headers}")
-        logger.debug(f"Kwargs: {kwargs}")
+        if logger.isEnabledFor(logging.DEBUG):
+            # Guarded: repr of a long message list is expensive even when the
+            # line is ultimately discarded.
+            logger.debug("Sending request to %s", url)
+            logger.debug("Method: %s", method)
+            logger.debug("Headers: %r", headers)
+            logger.debug("Kwargs: %r", kwargs)
 
         try:
             if method == "GET":
                 response = self.session.get(url, headers=headers, params=kwargs)
             else:
-                response = self.session.post(url, headers=headers, json=kwargs, stream=stream)
+                # Serialize the body ourselves so the faster json_utils backend
+                # is used instead of requests' internal stdlib json.dumps.
+                response = self.session.post(url, headers=headers,
+                                             data=json_utils.dumps_bytes(kwargs), stream=stream)
 
             response.raise_for_status()
 
             if stream:
                 return self._handle_stream_response(response)
             else:
-                return response.json()
+                # Parse the raw bytes directly; response.json() would go
+                # through charset detection and the stdlib parser.
+                return json_utils.loads(response.content)
         except requests.RequestException as e:
-            logger.error(f"API call error: {str(e)}")
+            logger.error("API call error: %s", str(e))
             error_message = "No error message provided"
             if e.response is not None:
                 try:
@@ -337,9 +450,9 @@ class API(BaseAPI):
                 except json.JSONDecodeError:
                     error_message = e.response.text
 
-            logger.error(f"Error message: {error_message}")
-            logger.error(f"Response status code: {e.response.status_code if e.response else 'N/A'}")
-            logger.error(f"Response content: {e.response.text if e.response else 'N/A'}")
+            logger.error("Error message: %s", error_message)
+            logger.error("Response status code: %s", e.response.status_code if e.response else 'N/A')
+            logger.error("Response content: %s", e.response.text if e.response else 'N/A')
             raise self._handle_error(e, error_message)
 
     def _handle_stream_response(self, response) -> Generator:
@@ -353,12 +466,53 @@ class API(BaseAPI):
             Dict: Parsed JSON data from each line of the stream.
         """
         logger.debug("Entering _handle_stream_response")
-        for line in response.iter_lines():
-            if line:
-                logger.debug(f"Received line: {line.decode('utf-8')}")
-                yield json.loads(line.decode('utf-8'))
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        # Lines stay as bytes; json_utils.loads accepts them directly, so no
+        # per-line UTF-8 decode or f-string formatting happens unless debug
+        # logging is actually on.
+        for line in self._iter_stream_lines(response):
+            if not line:
+                continue
+            if line.startswith(b"data: "):
+                line = line[6:]
+            if line == b"[DONE]":
+                break
+            if debug_enabled:
+                logger.debug("Received line: %r", line)
+            yield json_utils.loads(line)
         logger.debug("Exiting _handle_stream_response")
 
+    @staticmethod
+    def _iter_stream_lines(response, chunk_size: int = 8192) -> Generator:
+        """
+        Yield complete lines from a streaming response as soon as they arrive.
+
+        Accumulates raw chunks in a single bytearray and slices each line out
+        the moment its newline is seen, so an event is emitted as soon as it
+        is complete instead of going through iter_lines' internal rebuffering.
+
+        Args:
+            response (requests.Response): The streaming response object.
+            chunk_size (int): Maximum bytes pulled per socket read.
+
+        Yields:
+            bytes: One line per iteration, without the trailing newline.
+        """
+        buf = bytearray()
+        for chunk in response.raw.stream(chunk_size, decode_content=True):
+            buf.extend(chunk)
+            start = 0
+            while (idx := buf.find(b'\n', start)) != -1:
+                line = bytes(buf[start:idx])
+                if line.endswith(b'\r'):
+                    line = line[:-1]
+                start = idx + 1
+                yield line
+            if start:
+                del buf[:start]
+        if buf:
+            yield bytes(buf)
+
     def _handle_error(self, error: requests.RequestException, error_message: str) -> InvokeError:
         """
         Handle errors from API requests.
@@ -370,21 +524,15 @@ class API(BaseAPI):
         Returns:
             InvokeError: An appropriate InvokeError subclass based on the type of error.
         """
+        message = f"{str(error)}. Error message: {error_message}"
         if isinstance(error, requests.ConnectionError):
-            return InvokeConnectionError(f"{str(error)}. Error message: {error_message}")
+            return InvokeConnectionError(message)
         elif isinstance(error, requests.Timeout):
-            return InvokeConnectionError(f"{str(error)}. Error message: {error_message}")
+            return InvokeConnectionError(message)
         elif isinstance(error, requests.HTTPError):
-            if error.response.status_code == 429:
-                return InvokeRateLimitError(f"{str(error)}. Error message: {error_message}")
-            elif error.response.status_code in (401, 403):
-                return InvokeAuthorizationError(f"{str(error)}. Error message: {error_message}")
-            elif error.response.status_code >= 500:
-                return InvokeServerUnavailableError(f"{str(error)}. Error message: {error_message}")
-            else:
-                return InvokeBadRequestError(f"{str(error)}. Error message: {error_message}")
+            return map_http_error(error.response.status_code, message)
         else:
-            return InvokeError(f"{str(error)}. Error message: {error_message}")
+            return InvokeError(message)
 
     def set_proxy(self, proxy_url: str):
         """
@@ -397,4 +545,4 @@ class API(BaseAPI):
             'http': proxy_url,
             'https': proxy_url
         }
-        logger.info(f"Proxy set to {proxy_url}")
\ No newline at end of file
+        logger.info("Proxy set to %s", proxy_url)
\ No newline at end of file
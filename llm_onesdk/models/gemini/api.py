@@ -1,10 +1,12 @@
-from ..base_api import BaseAPI
+from ..base_api import BaseAPI, provider_specific, get_shared_session, map_http_error
 from typing import List, Dict, Union, Generator
 import requests
 import json
+import logging
 import os
-from urllib.parse import urljoin
+from urllib3.util.retry import Retry
 from ...utils.logger import logger
+from ...utils import json_utils
 from ...utils.error_handler import (
     InvokeError,
     InvokeConnectionError,
@@ -33,11 +35,43 @@ class API(BaseAPI):
             raise ValueError(
                 "API key must be provided either in credentials or as an environment variable GEMINI_API_KEY")
         self.base_url = credentials.get("api_url", self.BASE_URL)
-        self.session = requests.Session()
-        self.session.headers.update({
+        # The API key travels as a query parameter, so the pooled session can
+        # be shared by every instance pointed at the same base URL regardless
+        # of credentials.
+        if "session" in credentials:
+            # An explicitly injected session wins over the shared pool.
+            self._configure_session(self.session)
+        else:
+            self.session = get_shared_session(
+                ('gemini', self.base_url),
+                configure=self._configure_session,
+            )
+        # Endpoints embed the model name, so the full URL cannot be
+        # pre-enumerated; precompute the versioned prefix once instead of
+        # re-parsing the base URL with urljoin on every call.
+        base = self.base_url if self.base_url.endswith('/') else self.base_url + '/'
+        self._api_prefix = base + "v1/"
+        logger.info("Google Gemini API initialized")
+
+    @staticmethod
+    def _configure_session(session: requests.Session):
+        """Mount a larger keep-alive pool with transient-error retries and default headers."""
+        # Retry transient gateway failures at the connection layer; the
+        # Retry-After header is honored for 429 before anything is raised.
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=["POST", "GET"],
+            respect_retry_after_header=True,
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=20, pool_maxsize=100, max_retries=retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
             'Content-Type': 'application/json'
         })
-        logger.info("Google Gemini API initialized")
 
     def generate(self, model: str, messages: List[Dict[str, Union[str, List[Dict[str, str]]]]], **kwargs) -> Dict:
         """
@@ -51,7 +85,7 @@ class API(BaseAPI):
         Returns:
             Dict: The generated content.
         """
-        logger.info(f"Generating content with model: {model}")
+        logger.info("Generating content with model: %s", model)
         endpoint = f"{model}:generateContent"
         return self._call_api(endpoint, messages=messages, **kwargs)
 
@@ -68,11 +102,11 @@ class API(BaseAPI):
         Returns:
             Generator: A generator yielding response chunks.
         """
-        logger.info(f"Generating streaming content with model: {model}")
+        logger.info("Generating streaming content with model: %s", model)
         endpoint = f"{model}:streamGenerateContent"
         return self._call_api(endpoint, messages=messages, stream=True, **kwargs)
 
-    @BaseAPI.provider_specific
+    @provider_specific
     def generate_content_with_image(self, model: str,
                                     messages: List[Dict[str, Union[str, List[Dict[str, Union[str, Dict]]]]]],
                                     **kwargs) -> Dict:
@@ -87,7 +121,7 @@ class API(BaseAPI):
         Returns:
             Dict: The generated content.
         """
-        logger.info(f"Generating content with image using model: {model}")
+        logger.info("Generating content with image using model: %s", model)
         endpoint = f"{model}:generateContent"
         return self._call_api(endpoint, messages=messages, **kwargs)
 
@@ -103,7 +137,7 @@ class API(BaseAPI):
         Returns:
             Dict: The created embeddings.
         """
-        logger.info(f"Creating embedding with model: {model}")
+        logger.info("Creating embedding with model: %s", model)
         endpoint = f"{model}:embedContent"
         return self._call_api(endpoint, content=input, **kwargs)
 
@@ -118,11 +152,11 @@ class API(BaseAPI):
         Returns:
             int: The number of tokens in the messages.
         """
-        logger.info(f"Counting tokens for model: {model}")
+        logger.info("Counting tokens for model: %s", model)
         endpoint = f"{model}:countTokens"
         response = self._call_api(endpoint, contents=messages)
         token_count = response.get('totalTokens', 0)
-        logger.info(f"Token count for model {model}: {token_count}")
+        logger.info("Token count for model %s: %s", model, token_count)
         return token_count
 
     def _call_api(self, endpoint: str, **kwargs):
@@ -139,26 +173,38 @@ class API(BaseAPI):
         Raises:
             InvokeError: If there's an error during the API call.
         """
-        url = urljoin(self.base_url, f"v1/{endpoint}")
-        params = {'key': self.api_key}
+        url = self._api_prefix + endpoint
         stream = kwargs.pop('stream', False)
+        # alt=sse makes streamGenerateContent emit one "data: {...}" line per
+        # chunk instead of a single pretty-printed JSON array, so chunks can
+        # be parsed as they arrive rather than buffering the whole document.
+        params = {'key': self.api_key, 'alt': 'sse'} if stream else {'key': self.api_key}
 
         payload = kwargs
 
-        logger.debug(f"Sending request to {url}")
-        logger.debug(f"Payload: {json.dumps(payload, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            # Guarded: pretty-printing the payload is expensive even when the
+            # line is ultimately discarded.
+            logger.debug("Sending request to %s", url)
+            logger.debug("Payload: %s", json.dumps(payload, indent=2))
 
         try:
+            # Serialize the body ourselves so the faster json_utils backend is
+            # used instead of requests' internal stdlib json.dumps; the shared
+            # session already carries the Content-Type header.
+            body = json_utils.dumps_bytes(payload)
             if stream:
-                response = self.session.post(url, json=payload, params=params, stream=True)
+                response = self.session.post(url, data=body, params=params, stream=True)
                 response.raise_for_status()
                 return self._handle_stream_response(response)
             else:
-                response = self.session.post(url, json=payload, params=params)
+                response = self.session.post(url, data=body, params=params)
                 response.raise_for_status()
-                return response.json()
+                # Parse the raw bytes directly; response.json() would go
+                # through charset detection and the stdlib parser.
+                return json_utils.loads(response.content)
         except requests.RequestException as e:
-            logger.error(f"API call error: {str(e)}")
+            logger.error("API call error: %s", str(e))
             raise self._handle_error(e)
 
     def _handle_stream_response(self, response) -> Generator:
@@ -172,10 +218,17 @@ class API(BaseAPI):
             Dict: Parsed JSON data from each line of the stream.
         """
         logger.debug("Entering _handle_stream_response")
-        for line in response.iter_lines():
-            if line:
-                logger.debug(f"Received line: {line.decode('utf-8')}")
-                yield json.loads(line.decode('utf-8'))
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        # Lines stay as bytes; json_utils.loads accepts them directly, so no
+        # per-line UTF-8 decode or f-string formatting happens unless debug
+        # logging is actually on. With alt=sse every payload line carries a
+        # "data: " prefix; anything else (event lines, keep-alives) is skipped.
+        for line in response.iter_lines(chunk_size=8192, decode_unicode=False):
+            if not line or not line.startswith(b'data: '):
+                continue
+            if debug_enabled:
+                logger.debug("Received line: %r", line)
+            yield json_utils.loads(line[6:])
         logger.debug("Exiting _handle_stream_response")
 
     def _handle_error(self, error: requests.RequestException) -> InvokeError:
@@ -193,14 +246,7 @@ class API(BaseAPI):
         elif isinstance(error, requests.Timeout):
             return InvokeConnectionError(str(error))
         elif isinstance(error, requests.HTTPError):
-            if error.response.status_code == 429:
-                return InvokeRateLimitError(str(error))
-            elif error.response.status_code in (401, 403):
-                return InvokeAuthorizationError(str(error))
-            elif error.response.status_code >= 500:
-                return InvokeServerUnavailableError(str(error))
-            else:
-                return InvokeBadRequestError(str(error))
+            return map_http_error(error.response.status_code, str(error))
         else:
             return InvokeError(str(error))
 
@@ -215,4 +261,4 @@ class API(BaseAPI):
             'http': proxy_url,
             'https': proxy_url
         }
-        logger.info(f"Proxy set to {proxy_url}")
\ No newline at end of file
+        logger.info("Proxy set to %s", proxy_url)
\ No newline at end of file
@@ -1,10 +1,12 @@
-from ..base_api import BaseAPI, provider_specific
+from ..base_api import BaseAPI, provider_specific, map_http_error
 from typing import List, Dict, Union, Generator
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import json
+import logging
 import os
-from urllib.parse import urljoin
 from ...utils.logger import logger
+from ...utils import json_utils
 from ...utils.error_handler import (
     InvokeError,
     InvokeConnectionError,
@@ -14,6 +16,13 @@ from ...utils.error_handler import (
     InvokeBadRequestError,
 )
 
+def _chat_delta_transform(data):
+    """Reshape a chat-completion chunk to {'delta': {'text': ...}}; None skips it."""
+    try:
+        return {'delta': {'text': data['choices'][0]['delta']['content']}}
+    except (KeyError, IndexError):
+        return None
+
 class API(BaseAPI):
     """API class for interacting with the Kimi (Moonshot) API."""
 
@@ -32,13 +41,35 @@ class API(BaseAPI):
             raise ValueError(
                 "API key must be provided either in credentials or as an environment variable MOONSHOT_API_KEY")
         self.base_url = credentials.get("api_url", self.BASE_URL)
-        self.session = requests.Session()
+        # Reuse the session the base class created; replacing it here would
+        # throw away its connection pool.
         self.session.headers.update({
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
         })
+        # Enlarge the keep-alive pool beyond requests' default of 10 so
+        # chat, file and cache calls amortize TLS setup across reused
+        # connections.
+        adapter = requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=20)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Built once; _call_api picks this by reference instead of
+        # allocating a fresh override dict per streaming request.
+        self._stream_headers = {'Accept': 'text/event-stream',
+                                # SSE frames must arrive unbuffered; compression
+                                # would let the edge coalesce them.
+                                'Accept-Encoding': 'identity'}
+        # Endpoints are fixed literals, so the absolute URLs are computed
+        # once here instead of running urljoin's parse/rebuild per request;
+        # dynamic paths fall back to plain concatenation in _call_api.
+        base = self.base_url if self.base_url.endswith('/') else self.base_url + '/'
+        self._base_url_with_slash = base
+        self._endpoint_urls = {
+            endpoint: base + endpoint
+            for endpoint in ("models", "chat/completions", "caching", "caching/refs/tags")
+        }
         logger.info("Kimi API initialized")
-        logger.debug(f"Base URL: {self.BASE_URL}")
+        logger.debug("Base URL: %s", self.BASE_URL)
 
     def list_models(self) -> List[Dict]:
         """
@@ -48,9 +79,9 @@ class API(BaseAPI):
             List[Dict]: A list of dictionaries containing model information.
         """
         logger.info("Fetching available models")
-        response = self._call_api("models", method="GET")
+        response = self._cached_get("models")
         models = response.get('data', [])
-        logger.info(f"Available models: {[model['id'] for model in models]}")
+        logger.info("Available models: %s", [model['id'] for model in models])
         return models
 
     @provider_specific
@@ -64,11 +95,30 @@ class API(BaseAPI):
         Returns:
             Dict: A dictionary containing model information.
         """
-        logger.info(f"Fetching information for model: {model_id}")
-        model_info = self._call_api(f"models/{model_id}", method="GET")
-        logger.info(f"Model info for {model_id}: {model_info}")
+        logger.info("Fetching information for model: %s", model_id)
+        model_info = self._cached_get(f"models/{model_id}")
+        logger.info("Model info for %s: %s", model_id, model_info)
         return model_info
 
+    @provider_specific
+    def list_models_with_details(self) -> List[Dict]:
+        """
+        List available models and fetch each model's details in parallel.
+
+        The per-model lookups are I/O bound, so they are fanned out over a
+        thread pool sharing the session's keep-alive connections; N ids cost
+        roughly one round-trip of latency instead of N sequential ones.
+
+        Returns:
+            List[Dict]: Detailed information for each available model, in
+                listing order.
+        """
+        models = self.list_models()
+        if not models:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(models), 10)) as executor:
+            return list(executor.map(lambda m: self.get_model(m['id']), models))
+
     def generate(self, model: str, messages: List[Dict[str, Union[str, List[Dict[str, str]]]]], **kwargs) -> Dict:
         """
         Generate a response using the specified model.
@@ -81,8 +131,13 @@ class API(BaseAPI):
         Returns:
             Dict: The generated response.
         """
-        logger.info(f"Generating response with model: {model}")
-        return self._call_api("chat/completions", model=model, messages=messages, **kwargs)
+        logger.info("Generating response with model: %s", model)
+        cached = self._response_cache_get(model, messages, kwargs)
+        if cached is not None:
+            return cached
+        response = self._call_api("chat/completions", model=model, messages=messages, **kwargs)
+        self._response_cache_put(model, messages, kwargs, response)
+        return response
 
     def stream_generate(self, model: str, messages: List[Dict[str, Union[str, List[Dict[str, str]]]]],
                         **kwargs) -> Generator:
@@ -97,14 +152,12 @@ class API(BaseAPI):
         Returns:
             Generator: A generator yielding response chunks.
         """
-        logger.info(f"Generating streaming response with model: {model}")
+        logger.info("Generating streaming response with model: %s", model)
         kwargs['stream'] = True
-        response = self._call_api("chat/completions", model=model, messages=messages, **kwargs)
-        for chunk in response:
-            if 'choices' in chunk and len(chunk['choices']) > 0:
-                delta = chunk['choices'][0].get('delta', {})
-                if 'content' in delta:
-                    yield {'delta': {'text': delta['content']}}
+        # The reshape runs inside _handle_stream_response's parse loop, so
+        # there is a single generator frame per token instead of two.
+        return self._call_api("chat/completions", model=model, messages=messages,
+                              transform=_chat_delta_transform, **kwargs)
 
     def count_tokens(self, model: str, messages: List[Dict[str, Union[str, List[Dict[str, str]]]]]) -> int:
         """
@@ -117,10 +170,10 @@ class API(BaseAPI):
         Returns:
             int: The number of tokens in the messages.
         """
-        logger.info(f"Counting tokens for model: {model}")
+        logger.info("Counting tokens for model: %s", model)
         response = self._call_api("chat/completions", model=model, messages=messages, max_tokens=1)
         token_count = response['usage']['prompt_tokens']
-        logger.info(f"Token count for model {model}: {token_count}")
+        logger.info("Token count for model %s: %s", model, token_count)
         return token_count
 
     @provider_specific
@@ -157,7 +210,9 @@ class API(BaseAPI):
         elif ttl:
             payload["ttl"] = ttl
 
-        return self._call_api("caching", method="POST", **payload)
+        result = self._call_api("caching", method="POST", **payload)
+        self._get_cache.invalidate()
+        return result
 
     @provider_specific
     def list_caches(self, limit: int = 20, order: str = "desc", after: str = None, before: str = None,
@@ -186,7 +241,7 @@ class API(BaseAPI):
             for key, value in metadata.items():
                 params[f"metadata[{key}]"] = value
 
-        return self._call_api("caching", method="GET", **params)
+        return self._cached_get("caching", **params)
 
     @provider_specific
     def delete_cache(self, cache_id: str) -> Dict:
@@ -199,8 +254,10 @@ class API(BaseAPI):
         Returns:
             Dict: The response from the API.
         """
-        logger.info(f"Deleting context cache: {cache_id}")
-        return self._call_api(f"caching/{cache_id}", method="DELETE")
+        logger.info("Deleting context cache: %s", cache_id)
+        result = self._call_api(f"caching/{cache_id}", method="DELETE")
+        self._get_cache.invalidate()
+        return result
 
     @provider_specific
     def update_cache(self, cache_id: str, metadata: Dict[str, str] = None, expired_at: int = None,
@@ -217,7 +274,7 @@ class API(BaseAPI):
         Returns:
             Dict: The updated cache information.
         """
-        logger.info(f"Updating context cache: {cache_id}")
+        logger.info("Updating context cache: %s", cache_id)
         payload = {}
         if metadata:
             payload["metadata"] = metadata
@@ -226,7 +283,9 @@ class API(BaseAPI):
         elif ttl:
             payload["ttl"] = ttl
 
-        return self._call_api(f"caching/{cache_id}", method="PUT", **payload)
+        result = self._call_api(f"caching/{cache_id}", method="PUT", **payload)
+        self._get_cache.invalidate()
+        return result
 
     @provider_specific
     def get_cache(self, cache_id: str) -> Dict:
@@ -239,8 +298,8 @@ class API(BaseAPI):
         Returns:
             Dict: Information about the specified cache.
         """
-        logger.info(f"Getting context cache: {cache_id}")
-        return self._call_api(f"caching/{cache_id}", method="GET")
+        logger.info("Getting context cache: %s", cache_id)
+        return self._cached_get(f"caching/{cache_id}")
 
     @provider_specific
     def create_tag(self, tag: str, cache_id: str) -> Dict:
@@ -254,8 +313,10 @@ class API(BaseAPI):
         Returns:
             Dict: Information about the created tag.
         """
-        logger.info(f"Creating tag '{tag}' for cache: {cache_id}")
-        return self._call_api("caching/refs/tags", method="POST", tag=tag, cache_id=cache_id)
+        logger.info("Creating tag '%s' for cache: %s", tag, cache_id)
+        result = self._call_api("caching/refs/tags", method="POST", tag=tag, cache_id=cache_id)
+        self._get_cache.invalidate()
+        return result
 
     @provider_specific
     def list_tags(self, limit: int = 20, order: str = "desc", after: str = None, before: str = None) -> Dict:
@@ -278,7 +339,7 @@ class API(BaseAPI):
             "after": after,
             "before": before,
         }
-        return self._call_api("caching/refs/tags", method="GET", **params)
+        return self._cached_get("caching/refs/tags", **params)
 
     @provider_specific
     def delete_tag(self, tag: str) -> Dict:
@@ -291,8 +352,10 @@ class API(BaseAPI):
         Returns:
             Dict: The response from the API.
         """
-        logger.info(f"Deleting tag: {tag}")
-        return self._call_api(f"caching/refs/tags/{tag}", method="DELETE")
+        logger.info("Deleting tag: %s", tag)
+        result = self._call_api(f"caching/refs/tags/{tag}", method="DELETE")
+        self._get_cache.invalidate()
+        return result
 
     @provider_specific
     def get_tag(self, tag: str) -> Dict:
@@ -305,8 +368,8 @@ class API(BaseAPI):
         Returns:
             Dict: Information about the specified tag.
         """
-        logger.info(f"Getting tag: {tag}")
-        return self._call_api(f"caching/refs/tags/{tag}", method="GET")
+        logger.info("Getting tag: %s", tag)
+        return self._cached_get(f"caching/refs/tags/{tag}")
 
     @provider_specific
     def get_tag_content(self, tag: str) -> Dict:
@@ -319,8 +382,8 @@ class API(BaseAPI):
         Returns:
             Dict: The content of the cache associated with the specified tag.
         """
-        logger.info(f"Getting content for tag: {tag}")
-        return self._call_api(f"caching/refs/tags/{tag}/content", method="GET")
+        logger.info("Getting content for tag: %s", tag)
+        return self._cached_get(f"caching/refs/tags/{tag}/content")
 
     def _call_api(self, endpoint: str, method: str = "POST", **kwargs):
         """
@@ -337,76 +400,136 @@ class API(BaseAPI):
         Raises:
             InvokeError: If there's an error during the API call.
         """
-        url = urljoin(self.base_url, endpoint)
-        headers = self.session.headers.copy()
-
-        if kwargs.get('stream'):
-            headers['Accept'] = 'text/event-stream'
-
-        logger.debug(f"Sending request to {url}")
-        logger.debug(f"Headers: {headers}")
-        logger.debug(f"Kwargs: {json.dumps(kwargs, indent=2)}")
+        url = self._endpoint_urls.get(endpoint) or self._base_url_with_slash + endpoint
+        # Control flags popped once before kwargs becomes the request body.
+        transform = kwargs.pop('transform', None)
+        stream = kwargs.pop('stream', False)
+        # The session already carries the default headers; only the streaming
+        # Accept override is passed per request, and requests merges it on top.
+        headers = self._stream_headers if stream else None
+
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            # Guarded: pretty-printing the request body is O(payload size)
+            # even when the line is ultimately discarded.
+            logger.debug("Sending request to %s", url)
+            logger.debug("Headers: %s", headers)
+            logger.debug("Kwargs: %s", json.dumps(kwargs, indent=2))
 
         try:
             if method == "GET":
                 response = self.session.get(url, params=kwargs, headers=headers)
             else:
-                response = self.session.request(method, url, json=kwargs, headers=headers)
-
-            logger.debug(f"Response status code: {response.status_code}")
-            logger.debug(f"Response headers: {response.headers}")
-
-            try:
-                if not kwargs.get('stream'):
-                    response_body = response.json()
-                    logger.debug(f"Response body: {json.dumps(response_body, indent=2)}")
-                else:
-                    logger.debug("Streaming response, body not available")
-            except json.JSONDecodeError:
-                logger.debug(f"Response body (not JSON): {response.text}")
+                # Moonshot expects the stream flag inside the JSON body, so it
+                # is re-inserted only for streaming calls; non-stream bodies
+                # stay smaller.
+                body = {**kwargs, 'stream': True} if stream else kwargs
+                # Serialize the body ourselves so the faster json_utils backend
+                # is used instead of requests' internal stdlib json.dumps.
+                response = self.session.request(method, url,
+                                                data=json_utils.dumps_bytes(body), headers=headers,
+                                                stream=stream)
+
+            if debug_enabled:
+                logger.debug("Response status code: %s", response.status_code)
+                logger.debug("Response headers: %s", response.headers)
+                try:
+                    if not stream:
+                        logger.debug("Response body: %s", json.dumps(response.json(), indent=2))
+                    else:
+                        logger.debug("Streaming response, body not available")
+                except json.JSONDecodeError:
+                    logger.debug("Response body (not JSON): %s", response.text)
 
             response.raise_for_status()
 
-            if kwargs.get('stream'):
-                return self._handle_stream_response(response)
+            if stream:
+                return self._handle_stream_response(response, transform)
             else:
-                return response.json()
+                # Parse the raw bytes directly; response.json() would go
+                # through charset detection and the stdlib parser.
+                return json_utils.loads(response.content)
         except requests.RequestException as e:
-            logger.error(f"Request failed: {str(e)}")
+            logger.error("Request failed: %s", str(e))
             if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Error response status code: {e.response.status_code}")
-                logger.error(f"Error response headers: {e.response.headers}")
+                logger.error("Error response status code: %s", e.response.status_code)
+                logger.error("Error response headers: %s", e.response.headers)
                 try:
                     error_body = e.response.json()
-                    logger.error(f"Error response body: {json.dumps(error_body, indent=2)}")
+                    logger.error("Error response body: %s", json.dumps(error_body, indent=2))
                 except json.JSONDecodeError:
-                    logger.error(f"Error response body (not JSON): {e.response.text}")
+                    logger.error("Error response body (not JSON): %s", e.response.text)
             raise self._handle_error(e)
 
-    def _handle_stream_response(self, response) -> Generator:
+    def _handle_stream_response(self, response, transform=None) -> Generator:
         """
         Handle a streaming response from the API.
 
         Args:
             response (requests.Response): The streaming response object.
+            transform (Optional[Callable]): Applied to each parsed chunk in
+                the same loop; chunks it maps to None are skipped.
 
         Yields:
             Dict: Parsed JSON data from each line of the stream.
         """
         logger.debug("Entering _handle_stream_response")
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                logger.debug(f"Received line: {line}")
-                if line.startswith('data: '):
-                    try:
-                        data = json.loads(line[6:])
-                        logger.debug(f"Parsed data: {json.dumps(data, indent=2)}")
-                        yield data
-                    except json.JSONDecodeError:
-                        logger.error(f"Failed to parse streaming response: {line}")
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        # Lines stay as bytes; json_utils.loads accepts them directly, so no
+        # per-line UTF-8 decode happens on the hot path.
+        # The splitter runs on a producer thread so the next frame's socket
+        # read overlaps this frame's JSON decode.
+        for line in self._pipelined_iter(self._iter_stream_lines(response)):
+            if not line or not line.startswith(b'data: '):
+                continue
+            line = line[6:]
+            if line == b'[DONE]':
+                break
+            try:
+                data = json_utils.loads(line)
+                if debug_enabled:
+                    # Guarded: pretty-printing every chunk runs per token.
+                    logger.debug("Parsed data: %s", json.dumps(data, indent=2))
+                if transform is not None:
+                    data = transform(data)
+                    if data is None:
+                        continue
+                yield data
+            except json_utils.JSONDecodeError:
+                logger.error("Failed to parse streaming response: %r", line)
         logger.debug("Exiting _handle_stream_response")
 
+    @staticmethod
+    def _iter_stream_lines(response, chunk_size: int = 8192) -> Generator:
+        """
+        Yield complete lines from a streaming response as soon as they arrive.
+
+        Accumulates raw chunks in a single bytearray and slices each line out
+        the moment its newline is seen, so an event is emitted as soon as it
+        is complete instead of going through iter_lines' internal rebuffering.
+
+        Args:
+            response (requests.Response): The streaming response object.
+            chunk_size (int): Maximum bytes pulled per socket read.
+
+        Yields:
+            bytes: One line per iteration, without the trailing newline.
+        """
+        buf = bytearray()
+        for chunk in response.raw.stream(chunk_size, decode_content=True):
+            buf.extend(chunk)
+            start = 0
+            while (idx := buf.find(b'\n', start)) != -1:
+                line = bytes(buf[start:idx])
+                if line.endswith(b'\r'):
+                    line = line[:-1]
+                start = idx + 1
+                yield line
+            if start:
+                del buf[:start]
+        if buf:
+            yield bytes(buf)
+
     def _handle_error(self, error: requests.RequestException) -> InvokeError:
         """
         Handle errors from API requests.
@@ -417,19 +540,11 @@ class API(BaseAPI):
         Returns:
             InvokeError: An appropriate InvokeError subclass based on the type of error.
         """
-        if isinstance(error, requests.ConnectionError):
-            return InvokeConnectionError(str(error))
-        elif isinstance(error, requests.Timeout):
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
             return InvokeConnectionError(str(error))
         elif isinstance(error, requests.HTTPError):
-            if error.response.status_code == 429:
-                return InvokeRateLimitError(str(error))
-            elif error.response.status_code in (401, 403):
-                return InvokeAuthorizationError(str(error))
-            elif error.response.status_code >= 500:
-                return InvokeServerUnavailableError(str(error))
-            else:
-                return InvokeBadRequestError(str(error))
+            # Table-driven status dispatch shared with the other providers.
+            return map_http_error(error.response.status_code, str(error))
         else:
             return InvokeError(str(error))
 
@@ -444,4 +559,14 @@ class API(BaseAPI):
             'http': proxy_url,
             'https': proxy_url
         }
-        logger.info(f"Proxy set to {proxy_url}")
\ No newline at end of file
+        logger.info("Proxy set to %s", proxy_url)
+
+    def close(self):
+        """Close the underlying session and release its pooled connections."""
+        self.session.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
\ No newline at end of file
@@ -1,8 +1,8 @@
 import os
 import requests
 import json
+import logging
 from typing import List, Dict, Union, Generator, BinaryIO, Optional
-from urllib.parse import urljoin
 from ...utils.error_handler import (
     InvokeError,
     InvokeConnectionError,
@@ -12,7 +12,22 @@ from ...utils.error_handler import (
     InvokeBadRequestError,
 )
 from ...utils.logger import logger
-from ..base_api import BaseAPI, provider_specific
+from ...utils import json_utils
+from ..base_api import BaseAPI, provider_specific, map_http_error
+
+# Optional streaming multipart encoder. When requests-toolbelt is installed
+# uploads read the file lazily in chunks instead of buffering the whole body
+# in memory to compute its length; otherwise requests' buffered path is used.
+try:
+    from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
+except ImportError:
+    MultipartEncoder = None
+
+# Model-specific chat endpoint routes, consulted by generate and
+# stream_generate. Models not listed use the default chat/completions
+# endpoint; the pro endpoint keeps its own methods because its payload
+# shape differs.
+_CHAT_ENDPOINT: Dict[str, str] = {}
 
 class API(BaseAPI):
     """API class for interacting with the MiniMax API."""
@@ -33,13 +48,41 @@ class API(BaseAPI):
             raise ValueError(
                 "API key and Group ID must be provided either in credentials or as environment variables MINIMAX_API_KEY and MINIMAX_GROUP_ID")
         self.base_url = credentials.get("api_url", self.BASE_URL)
-        self.session = requests.Session()
+        # Reuse the session the base class created; replacing it here would
+        # throw away its connection pool.
         self.session.headers.update({
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
         })
+        # Enlarge the keep-alive pool beyond requests' default of 10 so
+        # many generate/embedding/file calls amortize TLS setup across
+        # reused connections.
+        adapter = requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=20)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Built once; _call_api picks this by reference instead of
+        # allocating a fresh override dict per streaming request.
+        self._stream_headers = {'Accept': 'text/event-stream',
+                                # SSE frames must arrive unbuffered; compression
+                                # would let the edge coalesce them.
+                                'Accept-Encoding': 'identity'}
+        # Endpoints are fixed literals, so the absolute URLs are computed
+        # once here instead of running urljoin's parse/rebuild per request;
+        # anything not in the table falls back to plain concatenation.
+        base = self.base_url if self.base_url.endswith('/') else self.base_url + '/'
+        self._base_url_with_slash = base
+        self._endpoint_urls = {
+            endpoint: base + endpoint
+            for endpoint in (
+                "chat/completions", "embeddings", "t2a_v2", "t2a_async_v2",
+                "query/t2a_async_query_v2", "video_generation", "query/video_generation",
+                "music_upload", "music_generation", "voice_clone", "text2voice",
+                "delete_voice", "text/chatcompletion_pro", "files/list", "files/upload",
+                "files/delete", "files/retrieve", "files/retrieve_content",
+            )
+        }
         logger.info("MiniMax API initialized")
-        logger.debug(f"Base URL: {self.BASE_URL}")
+        logger.debug("Base URL: %s", self.BASE_URL)
 
     def generate(self, model: str, messages: List[Dict[str, str]], **kwargs) -> Dict:
         """
@@ -53,7 +96,7 @@ class API(BaseAPI):
         Returns:
             Dict: The generated response.
         """
-        logger.info(f"Generating response with model: {model}")
+        logger.info("Generating response with model: %s", model)
 
         system_message = {
             "role": "system",
@@ -71,7 +114,13 @@ class API(BaseAPI):
             "temperature": kwargs.get('temperature', 0.01),
             "top_p": kwargs.get('top_p', 0.95),
         }
-        return self._call_api("chat/completions", method="POST", json=payload)
+        cached = self._response_cache_get(model, messages, kwargs)
+        if cached is not None:
+            return cached
+        endpoint = _CHAT_ENDPOINT.get(model, "chat/completions")
+        response = self._call_api(endpoint, method="POST", json=payload)
+        self._response_cache_put(model, messages, kwargs, response)
+        return response
 
     def stream_generate(self, model: str, messages: List[Dict[str, str]], **kwargs) -> Generator:
         """
@@ -85,7 +134,7 @@ class API(BaseAPI):
         Returns:
             Generator: A generator yielding response chunks.
         """
-        logger.info(f"Generating streaming response with model: {model}")
+        logger.info("Generating streaming response with model: %s", model)
 
         system_message = {
             "role": "system",
@@ -104,19 +153,24 @@ class API(BaseAPI):
             "top_p": kwargs.get('top_p', 0.95),
             "stream": True
         }
-        response = self._call_api("chat/completions", method="POST", json=payload, stream=True)
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    try:
-                        data = json.loads(line[6:])
-                        if 'choices' in data and data['choices']:
-                            delta = data['choices'][0].get('delta', {})
-                            if 'content' in delta:
-                                yield {'delta': {'text': delta['content']}}
-                    except json.JSONDecodeError:
-                        logger.error(f"Failed to parse streaming response: {line}")
+        endpoint = _CHAT_ENDPOINT.get(model, "chat/completions")
+        response = self._call_api(endpoint, method="POST", json=payload, stream=True)
+        # Lines stay as bytes; json_utils.loads accepts them directly, so no
+        # per-line UTF-8 decode happens on the hot path.
+        for line in self._pipelined_iter(self._iter_stream_lines(response)):
+            if not line or not line.startswith(b'data: '):
+                continue
+            line = line[6:]
+            if line == b'[DONE]':
+                break
+            try:
+                data = json_utils.loads(line)
+                if 'choices' in data and data['choices']:
+                    delta = data['choices'][0].get('delta', {})
+                    if 'content' in delta:
+                        yield {'delta': {'text': delta['content']}}
+            except json_utils.JSONDecodeError:
+                logger.error("Failed to parse streaming response: %r", line)
 
     def create_embedding(self, model: str, texts: List[str], type: str) -> Dict:
         """
@@ -130,7 +184,7 @@ class API(BaseAPI):
         Returns:
             Dict: The created embeddings.
         """
-        logger.info(f"Creating embedding with model: {model}")
+        logger.info("Creating embedding with model: %s", model)
         payload = {
             "model": model,
             "texts": texts,
@@ -153,7 +207,7 @@ class API(BaseAPI):
         Returns:
             Dict: The response from the text-to-speech API.
         """
-        logger.info(f"Converting text to speech with model: {model}")
+        logger.info("Converting text to speech with model: %s", model)
         payload = {
             "model": model,
             "text": text,
@@ -176,7 +230,7 @@ class API(BaseAPI):
         Returns:
             Dict: The response containing the task ID and status.
         """
-        logger.info(f"Creating video generation task with prompt: {prompt}")
+        logger.info("Creating video generation task with prompt: %s", prompt)
         payload = {
             "model": model,
             "prompt": prompt,
@@ -199,7 +253,7 @@ class API(BaseAPI):
         Returns:
             Dict: The status of the video generation task.
         """
-        logger.info(f"Querying video generation task: {task_id}")
+        logger.info("Querying video generation task: %s", task_id)
         return self._call_api(f"query/video_generation", method="GET", params={"task_id": task_id})
 
     @provider_specific
@@ -214,17 +268,17 @@ class API(BaseAPI):
         Returns:
             Dict: The response from the music upload API.
         """
-        logger.info(f"Uploading music file for purpose: {purpose}")
+        logger.info("Uploading music file for purpose: %s", purpose)
 
         files = {'file': (file.name, file, 'audio/mpeg')}
         data = {'purpose': purpose}
 
         try:
             response = self._call_api("music_upload", method="POST", files=files, data=data)
-            logger.debug(f"Response: {response}")
+            logger.debug("Response: %s", response)
             return response
         except InvokeError as e:
-            logger.error(f"Music upload failed: {str(e)}")
+            logger.error("Music upload failed: %s", str(e))
             raise
 
     @provider_specific
@@ -243,7 +297,7 @@ class API(BaseAPI):
         Returns:
             Dict: The response from the music generation API.
         """
-        logger.info(f"Generating music with model: {model}")
+        logger.info("Generating music with model: %s", model)
         payload = {
             "model": model,
             "lyrics": lyrics,
@@ -265,16 +319,18 @@ class API(BaseAPI):
         """
         logger.info("Listing files")
         params = {"purpose": purpose} if purpose else {}
-        response = self._call_api("files/list", method="GET", params=params)
+        response = self._cached_get("files/list", params=params)
         return response.get('files', [])
 
-    def upload_file(self, file: BinaryIO, purpose: str) -> Dict:
+    def upload_file(self, file: BinaryIO, purpose: str, progress_callback=None) -> Dict:
         """
         Upload a file to MiniMax.
 
         Args:
             file (BinaryIO): The file to upload.
             purpose (str): The purpose of the file upload.
+            progress_callback (Optional[Callable]): Called with the number of
+                bytes sent so far; only honored on the streaming upload path.
 
         Returns:
             Dict: The response from the file upload API.
@@ -282,13 +338,26 @@ class API(BaseAPI):
         Raises:
             InvokeError: If the file upload fails.
         """
-        logger.info(f"Uploading file for purpose: {purpose}")
-        files = {'file': (file.name, file, 'application/octet-stream')}
-        data = {'purpose': purpose}
-        headers = {'Content-Type': None}  # Let requests set the correct Content-Type
-        response = self._call_api("files/upload", method="POST", files=files, data=data, headers=headers)
+        logger.info("Uploading file for purpose: %s", purpose)
+        if MultipartEncoder is not None:
+            # Streaming path: the body is read from the file in chunks, so
+            # peak memory stays flat regardless of file size.
+            body = MultipartEncoder(fields={
+                'purpose': purpose,
+                'file': (file.name, file, 'application/octet-stream'),
+            })
+            if progress_callback is not None:
+                body = MultipartEncoderMonitor(body, lambda monitor: progress_callback(monitor.bytes_read))
+            headers = {'Content-Type': body.content_type}
+            response = self._call_api("files/upload", method="POST", data=body, headers=headers)
+        else:
+            files = {'file': (file.name, file, 'application/octet-stream')}
+            data = {'purpose': purpose}
+            headers = {'Content-Type': None}  # Let requests set the correct Content-Type
+            response = self._call_api("files/upload", method="POST", files=files, data=data, headers=headers)
         if isinstance(response, dict) and 'error' in response:
             raise InvokeError(f"File upload failed: {response['error']}")
+        self._get_cache.invalidate()
         return response
 
     def delete_file(self, file_id: str) -> Dict:
@@ -301,8 +370,10 @@ class API(BaseAPI):
         Returns:
             Dict: The response from the file deletion API.
         """
-        logger.info(f"Deleting file: {file_id}")
-        return self._call_api(f"files/delete", method="POST", json={"file_id": file_id})
+        logger.info("Deleting file: %s", file_id)
+        result = self._call_api(f"files/delete", method="POST", json={"file_id": file_id})
+        self._get_cache.invalidate()
+        return result
 
     def get_file_info(self, file_id: str) -> Dict:
         """
@@ -314,8 +385,8 @@ class API(BaseAPI):
         Returns:
             Dict: Information about the specified file.
         """
-        logger.info(f"Retrieving file info: {file_id}")
-        return self._call_api(f"files/retrieve", method="GET", params={"file_id": file_id})
+        logger.info("Retrieving file info: %s", file_id)
+        return self._cached_get("files/retrieve", params={"file_id": file_id})
 
     def get_file_content(self, file_id: str) -> bytes:
         """
@@ -327,8 +398,9 @@ class API(BaseAPI):
         Returns:
             bytes: The content of the specified file.
         """
-        logger.info(f"Retrieving file content: {file_id}")
-        response = self._call_api(f"files/retrieve_content", method="GET", params={"file_id": file_id}, data={})
+        logger.info("Retrieving file content: %s", file_id)
+        response = self._call_api(f"files/retrieve_content", method="GET", params={"file_id": file_id},
+                                  raw_response=True)
         return response
 
     def create_knowledge_base(self, name: str, embedding_model: str, operator_id: int, file_id: Optional[str] = None, **kwargs) -> Dict:
@@ -345,7 +417,7 @@ class API(BaseAPI):
         Returns:
             Dict: Information about the created knowledge base.
         """
-        logger.info(f"Creating knowledge base: {name}")
+        logger.info("Creating knowledge base: %s", name)
         payload = {
             "operator_id": operator_id,
             "name": name,
@@ -366,7 +438,7 @@ class API(BaseAPI):
         Returns:
             Dict: The response from the knowledge base deletion API.
         """
-        logger.info(f"Deleting knowledge base: {knowledge_base_id}")
+        logger.info("Deleting knowledge base: %s", knowledge_base_id)
         return self._call_api("embedding/delete_knowledge_base", method="POST", json={"knowledge_base_id": knowledge_base_id, "operator_id": operator_id})
 
     def get_knowledge_base(self, knowledge_base_id: str) -> Dict:
@@ -379,7 +451,7 @@ class API(BaseAPI):
         Returns:
             Dict: Information about the specified knowledge base.
         """
-        logger.info(f"Getting knowledge base: {knowledge_base_id}")
+        logger.info("Getting knowledge base: %s", knowledge_base_id)
         return self._call_api(f"embedding/query_knowledge_base", method="GET", params={"knowledge_base_id": knowledge_base_id})
 
     def list_knowledge_bases(self, page: int = 0, page_size: int = 10) -> Dict:
@@ -409,7 +481,7 @@ class API(BaseAPI):
         Returns:
             Dict: The response from the document addition API.
         """
-        logger.info(f"Adding document {file_id} to knowledge base {knowledge_base_id}")
+        logger.info("Adding document %s to knowledge base %s", file_id, knowledge_base_id)
         payload = {
             "knowledge_base_id": knowledge_base_id,
             "file_id": file_id,
@@ -430,7 +502,7 @@ class API(BaseAPI):
         Returns:
             Dict: The response from the document deletion API.
         """
-        logger.info(f"Deleting document {file_id} from knowledge base {knowledge_base_id}")
+        logger.info("Deleting document %s from knowledge base %s", file_id, knowledge_base_id)
         payload = {
             "knowledge_base_id": knowledge_base_id,
             "file_id": file_id,
@@ -450,7 +522,7 @@ class API(BaseAPI):
         Returns:
             Dict: The response from the ChatCompletion Pro API.
         """
-        logger.info(f"Using ChatCompletion Pro with model: {model}")
+        logger.info("Using ChatCompletion Pro with model: %s", model)
         payload = {
             "model": model,
             "messages": messages,
@@ -475,7 +547,7 @@ class API(BaseAPI):
         Returns:
             Generator: A generator yielding response chunks.
         """
-        logger.info(f"Using streaming ChatCompletion Pro with model: {model}")
+        logger.info("Using streaming ChatCompletion Pro with model: %s", model)
 
         payload = {
             "model": model,
@@ -495,18 +567,16 @@ class API(BaseAPI):
 
         response = self._call_api("text/chatcompletion_pro", method="POST", json=payload, stream=True)
 
-        for line in response.iter_lines():
-            if line:
-                chunk_str = line.decode("utf-8")
-                logger.debug(f"Received chunk: {chunk_str}")
-                if chunk_str.startswith("data: "):
-                    try:
-                        parsed_data = json.loads(chunk_str[6:])
-                        if "usage" not in parsed_data:  # Ignore the final usage information
-                            delta_content = parsed_data["choices"][0]["messages"]
-                            yield {'delta': delta_content}
-                    except json.JSONDecodeError:
-                        logger.error(f"Failed to parse streaming response: {chunk_str}")
+        for line in self._pipelined_iter(self._iter_stream_lines(response)):
+            if not line or not line.startswith(b'data: '):
+                continue
+            try:
+                parsed_data = json_utils.loads(line[6:])
+                if "usage" not in parsed_data:  # Ignore the final usage information
+                    delta_content = parsed_data["choices"][0]["messages"]
+                    yield {'delta': delta_content}
+            except json_utils.JSONDecodeError:
+                logger.error("Failed to parse streaming response: %r", line)
 
     @provider_specific
     def create_long_speech_task(self, model: str, text: str, voice_setting: Dict, audio_setting: Dict, **kwargs) -> Dict:
@@ -523,7 +593,7 @@ class API(BaseAPI):
         Returns:
             Dict: The response from the long speech generation API.
         """
-        logger.info(f"Creating long speech task with model: {model}")
+        logger.info("Creating long speech task with model: %s", model)
         payload = {
             "model": model,
             "text": text,
@@ -544,7 +614,7 @@ class API(BaseAPI):
         Returns:
             Dict: The status of the long speech generation task.
         """
-        logger.info(f"Querying long speech task: {task_id}")
+        logger.info("Querying long speech task: %s", task_id)
         return self._call_api(f"query/t2a_async_query_v2", method="GET", params={"task_id": task_id})
 
     @provider_specific
@@ -560,7 +630,7 @@ class API(BaseAPI):
         Returns:
             Dict: The response from the voice cloning API.
         """
-        logger.info(f"Cloning voice with file_id: {file_id}")
+        logger.info("Cloning voice with file_id: %s", file_id)
         payload = {
             "file_id": file_id,
             "voice_id": voice_id,
@@ -603,7 +673,7 @@ class API(BaseAPI):
         Returns:
             Dict: The response from the voice deletion API.
         """
-        logger.info(f"Deleting voice with voice_id: {voice_id}")
+        logger.info("Deleting voice with voice_id: %s", voice_id)
         payload = {
             "voice_type": voice_type,
             "voice_id": voice_id
@@ -625,51 +695,71 @@ class API(BaseAPI):
         Raises:
             InvokeError: If there's an error during the API call.
         """
-        url = urljoin(self.base_url, endpoint)
+        url = self._endpoint_urls.get(endpoint) or self._base_url_with_slash + endpoint
+        # Control flags popped once; they must not leak into the request.
+        stream = kwargs.pop('stream', False)
+        raw_response = kwargs.pop('raw_response', False)
         params = kwargs.pop('params', {})
         params['GroupId'] = self.group_id
 
-        headers = self.session.headers.copy()
-        if kwargs.get('stream'):
-            headers['Accept'] = 'text/event-stream'
+        # The session already carries the default headers; only overrides are
+        # passed per request, and requests merges them on top.
+        headers = self._stream_headers if stream else None
         if 'headers' in kwargs:
-            headers.update(kwargs.pop('headers'))
-
-        logger.debug(f"Sending request to {url}")
-        logger.debug(f"Headers: {headers}")
-        logger.debug(f"Method: {method}")
-        logger.debug(f"Params: {params}")
-        logger.debug(f"Kwargs: {json.dumps(kwargs, indent=2, default=str)}")
+            headers = {**(headers or {}), **kwargs.pop('headers')}
+
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            # Guarded: pretty-printing the request body is O(payload size)
+            # even when the line is ultimately discarded.
+            logger.debug("Sending request to %s", url)
+            logger.debug("Headers: %s", headers)
+            logger.debug("Method: %s", method)
+            logger.debug("Params: %s", params)
+            logger.debug("Kwargs: %s", json.dumps(kwargs, indent=2, default=str))
 
         try:
             if method == "GET":
                 response = self.session.get(url, headers=headers, params=params, **kwargs)
             elif method == "POST":
-                if 'files' in kwargs:
-                    response = self.session.post(url, headers=headers, params=params, files=kwargs['files'], data=kwargs.get('data'))
+                if 'files' in kwargs or 'data' in kwargs:
+                    # Multipart or pre-encoded bodies (including streaming
+                    # encoders) are handed to requests as-is.
+                    response = self.session.post(url, headers=headers, params=params,
+                                                 files=kwargs.get('files'), data=kwargs.get('data'))
                 else:
-                    response = self.session.post(url, headers=headers, params=params, json=kwargs.get('json'))
+                    # Serialize the body ourselves so the faster json_utils
+                    # backend is used instead of requests' internal stdlib
+                    # json.dumps.
+                    body = kwargs.get('json')
+                    response = self.session.post(
+                        url, headers=headers, params=params,
+                        data=None if body is None else json_utils.dumps_bytes(body),
+                        stream=stream)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
 
-            logger.debug(f"Response status code: {response.status_code}")
-            logger.debug(f"Response headers: {response.headers}")
-            logger.debug(f"Trace-ID: {response.headers.get('Trace-Id')}")
+            if debug_enabled:
+                logger.debug("Response status code: %s", response.status_code)
+                logger.debug("Response headers: %s", response.headers)
+                logger.debug("Trace-ID: %s", response.headers.get('Trace-Id'))
 
             response.raise_for_status()
 
-            if kwargs.get('raw_response'):
+            if raw_response:
                 return response.content
-            elif kwargs.get('stream'):
+            elif stream:
                 return response
             else:
-                return response.json()
+                # Parse the raw bytes directly; response.json() would go
+                # through charset detection and the stdlib parser.
+                return json_utils.loads(response.content)
         except requests.RequestException as e:
-            logger.error(f"Request failed: {str(e)}")
+            logger.error("Request failed: %s", str(e))
             if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Error response status code: {e.response.status_code}")
-                logger.error(f"Error response headers: {e.response.headers}")
-                logger.error(f"Error response content: {e.response.text}")
+                logger.error("Error response status code: %s", e.response.status_code)
+                logger.error("Error response headers: %s", e.response.headers)
+                logger.error("Error response content: %s", e.response.text)
             raise self._handle_error(e)
 
     def _handle_stream_response(self, response) -> Generator:
@@ -683,19 +773,52 @@ class API(BaseAPI):
             Dict: Parsed JSON data from each line of the stream.
         """
         logger.debug("Entering _handle_stream_response")
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                logger.debug(f"Received line: {line}")
-                if line.startswith('data: '):
-                    try:
-                        data = json.loads(line[6:])
-                        logger.debug(f"Parsed data: {json.dumps(data, indent=2)}")
-                        yield data
-                    except json.JSONDecodeError:
-                        logger.error(f"Failed to parse streaming response: {line}")
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        for line in self._pipelined_iter(self._iter_stream_lines(response)):
+            if not line or not line.startswith(b'data: '):
+                continue
+            try:
+                data = json_utils.loads(line[6:])
+                if debug_enabled:
+                    # Guarded: pretty-printing every chunk runs
+                    # per token.
+                    logger.debug("Parsed data: %s", json.dumps(data, indent=2))
+                yield data
+            except json_utils.JSONDecodeError:
+                logger.error("Failed to parse streaming response: %r", line)
         logger.debug("Exiting _handle_stream_response")
 
+    @staticmethod
+    def _iter_stream_lines(response, chunk_size: int = 8192) -> Generator:
+        """
+        Yield complete lines from a streaming response as soon as they arrive.
+
+        Accumulates raw chunks in a single bytearray and slices each line out
+        the moment its newline is seen, so an event is emitted as soon as it
+        is complete instead of going through iter_lines' internal rebuffering.
+
+        Args:
+            response (requests.Response): The streaming response object.
+            chunk_size (int): Maximum bytes pulled per socket read.
+
+        Yields:
+            bytes: One line per iteration, without the trailing newline.
+        """
+        buf = bytearray()
+        for chunk in response.raw.stream(chunk_size, decode_content=True):
+            buf.extend(chunk)
+            start = 0
+            while (idx := buf.find(b'\n', start)) != -1:
+                line = bytes(buf[start:idx])
+                if line.endswith(b'\r'):
+                    line = line[:-1]
+                start = idx + 1
+                yield line
+            if start:
+                del buf[:start]
+        if buf:
+            yield bytes(buf)
+
     def _handle_error(self, error: requests.RequestException) -> InvokeError:
         """
         Handle errors from API requests.
@@ -706,19 +829,11 @@ class API(BaseAPI):
         Returns:
             InvokeError: An appropriate InvokeError subclass based on the type of error.
         """
-        if isinstance(error, requests.ConnectionError):
-            return InvokeConnectionError(str(error))
-        elif isinstance(error, requests.Timeout):
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
             return InvokeConnectionError(str(error))
         elif isinstance(error, requests.HTTPError):
-            if error.response.status_code == 429:
-                return InvokeRateLimitError(str(error))
-            elif error.response.status_code in (401, 403):
-                return InvokeAuthorizationError(str(error))
-            elif error.response.status_code >= 500:
-                return InvokeServerUnavailableError(str(error))
-            else:
-                return InvokeBadRequestError(str(error))
+            # Table-driven status dispatch shared with the other providers.
+            return map_http_error(error.response.status_code, str(error))
         else:
             return InvokeError(str(error))
 
@@ -733,4 +848,14 @@ class API(BaseAPI):
             'http': proxy_url,
             'https': proxy_url
         }
-        logger.info(f"Proxy set to {proxy_url}")
\ No newline at end of file
+        logger.info("Proxy set to %s", proxy_url)
+
+    def close(self):
+        """Close the underlying session and release its pooled connections."""
+        self.session.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
\ No newline at end of file
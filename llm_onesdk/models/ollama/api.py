@@ -27,7 +27,8 @@ class API(BaseAPI):
         """
         super().__init__(credentials)
         self.base_url = credentials.get("base_url", self.BASE_URL)
-        self.session = requests.Session()
+        # Reuse the session the base class created; replacing it here would
+        # throw away its connection pool.
         self.session.headers.update({
             'Content-Type': 'application/json'
         })
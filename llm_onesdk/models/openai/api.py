@@ -12,7 +12,7 @@ from ...utils.error_handler import (
     InvokeBadRequestError,
 )
 from ...utils.logger import logger
-from ..base_api import BaseAPI, provider_specific
+from ..base_api import BaseAPI, map_http_error, provider_specific
 
 class API(BaseAPI):
     """API class for interacting with the OpenAI API."""
@@ -32,7 +32,8 @@ class API(BaseAPI):
             raise ValueError(
                 "API key must be provided either in credentials or as an environment variable OPENAI_API_KEY")
         self.base_url = credentials.get("api_url", self.BASE_URL)
-        self.session = requests.Session()
+        # Reuse the session the base class created; replacing it here would
+        # throw away its connection pool.
         self.session.headers.update({
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
@@ -478,19 +479,11 @@ class API(BaseAPI):
         Returns:
             InvokeError: An appropriate InvokeError subclass based on the type of error.
         """
-        if isinstance(error, requests.ConnectionError):
-            return InvokeConnectionError(str(error))
-        elif isinstance(error, requests.Timeout):
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
             return InvokeConnectionError(str(error))
         elif isinstance(error, requests.HTTPError):
-            if error.response.status_code == 429:
-                return InvokeRateLimitError(str(error))
-            elif error.response.status_code in (401, 403):
-                return InvokeAuthorizationError(str(error))
-            elif error.response.status_code >= 500:
-                return InvokeServerUnavailableError(str(error))
-            else:
-                return InvokeBadRequestError(str(error))
+            # Table-driven status dispatch shared with the other providers.
+            return map_http_error(error.response.status_code, str(error))
         else:
             return InvokeError(str(error))
 
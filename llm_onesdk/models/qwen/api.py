@@ -1,9 +1,12 @@
-from ..base_api import BaseAPI
+from ..base_api import BaseAPI, map_http_error
 from typing import List, Dict, Union, Generator
+import re
 import requests
 import json
 import os
 from urllib.parse import urljoin
+from urllib3.util.retry import Retry
+from ...utils import json_utils
 from ...utils.logger import logger
 from ...utils.error_handler import (
     InvokeError,
@@ -15,6 +18,22 @@ from ...utils.error_handler import (
     InvokeUnsupportedOperationError
 )
 
+# Whitespace-delimited token scan: findall runs one C-level loop instead of
+# allocating a split list per message.
+_WS_RE = re.compile(r'\S+')
+
+def _text_content(content) -> str:
+    """Extract the text of a message content field for token estimation.
+
+    Multimodal content arrives as a list of part dicts; only their text
+    parts should be counted, not the dict syntax of stringified parts.
+    """
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return ' '.join(part.get('text', '') for part in content if isinstance(part, dict))
+    return str(content)
+
 class API(BaseAPI):
     """API class for interacting with the Qwen API (DashScope)."""
 
@@ -22,6 +41,21 @@ class API(BaseAPI):
     TEXT_GENERATION_ENDPOINT = "text-generation/generation"
     MULTIMODAL_GENERATION_ENDPOINT = "multimodal-generation/generation"
 
+    # Optional generation parameters copied verbatim into the payload's
+    # "parameters" block when present in kwargs.
+    _OPTIONAL_PARAMS = frozenset({
+        'temperature', 'top_p', 'top_k', 'repetition_penalty', 'max_tokens',
+        'stop', 'seed', 'enable_search',
+    })
+
+    # SSE frames are typically 1-4 KB; reading 64 KB per socket call
+    # amortizes the kernel-to-user copies across many frames.
+    STREAM_CHUNK_SIZE = 65536
+
+    # Shared "parameters" template; calls without optional kwargs reference
+    # it directly and it is copied only when something has to be added.
+    _BASE_PARAMETERS = {"result_format": "message"}
+
     def __init__(self, credentials: Dict[str, str]):
         """
         Initialize the Qwen API client.
@@ -35,11 +69,33 @@ class API(BaseAPI):
             raise ValueError(
                 "API key must be provided either in credentials or as an environment variable DASHSCOPE_API_KEY")
         self.base_url = credentials.get("api_url", self.BASE_URL)
-        self.session = requests.Session()
+        # Reuse the session the base class created; replacing it here would
+        # throw away its connection pool.
         self.session.headers.update({
             'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'Connection': 'keep-alive'
         })
+        # Enlarge the keep-alive pool beyond requests' default of 10 and
+        # retry transient gateway failures at the connection layer, so
+        # threaded fan-out is not silently throttled by the pool.
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=["POST", "GET"],
+            respect_retry_after_header=True,
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=20, pool_maxsize=20, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Built once; _call_api picks this by reference instead of copying
+        # the session headers per streaming request.
+        self._stream_headers = {'Accept': 'text/event-stream'}
+        # Model name -> endpoint memo, filled on first use so the prefix
+        # checks in _get_endpoint run once per model instead of per call.
+        self._endpoint_by_model = {}
         logger.info("Qwen API initialized")
 
     def list_models(self) -> List[Dict]:
@@ -107,7 +163,8 @@ class API(BaseAPI):
         Returns:
             int: The estimated number of tokens in the messages.
         """
-        token_count = sum(len(str(message.get('content', '')).split()) for message in messages)
+        buf = '\n'.join(_text_content(message.get('content', '')) for message in messages)
+        token_count = len(_WS_RE.findall(buf))
         logger.info(f"Estimated token count for model {model}: {token_count}")
         return token_count
 
@@ -121,10 +178,13 @@ class API(BaseAPI):
         Returns:
             str: The endpoint URL for the given model.
         """
-        if model.startswith('qwen-vl') or model.startswith('qwen-audio'):
-            endpoint = self.MULTIMODAL_GENERATION_ENDPOINT
-        else:
-            endpoint = self.TEXT_GENERATION_ENDPOINT
+        endpoint = self._endpoint_by_model.get(model)
+        if endpoint is None:
+            if model.startswith(('qwen-vl', 'qwen-audio')):
+                endpoint = self.MULTIMODAL_GENERATION_ENDPOINT
+            else:
+                endpoint = self.TEXT_GENERATION_ENDPOINT
+            self._endpoint_by_model[model] = endpoint
         logger.debug(f"Using endpoint for model {model}: {endpoint}")
         return endpoint
 
@@ -147,16 +207,20 @@ class API(BaseAPI):
         """
         url = urljoin(self.base_url, endpoint)
         payload = self._prepare_payload(model, messages, stream, **kwargs)
-        headers = self.session.headers.copy()
-        if stream:
-            headers['Accept'] = 'text/event-stream'
+        # The session already carries the default headers; only the streaming
+        # Accept override is passed per request, picked by reference instead
+        # of copying the header dict on every call.
+        headers = self._stream_headers if stream else None
 
         logger.debug(f"Sending request to {url}")
         logger.debug(f"Headers: {headers}")
         logger.debug(f"Payload: {json.dumps(payload, indent=2)}")
 
         try:
-            response = self.session.post(url, json=payload, headers=headers, stream=stream)
+            # Serialize the body ourselves so the faster json_utils backend
+            # is used instead of requests' stdlib json fallback.
+            response = self.session.post(url, data=json_utils.dumps_bytes(payload),
+                                         headers=headers, stream=stream)
             response.raise_for_status()
 
             if stream:
@@ -164,7 +228,7 @@ class API(BaseAPI):
                 return self._handle_stream_response(response)
             else:
                 logger.debug("Received non-streaming response")
-                return self._handle_response(response.json())
+                return self._handle_response(json_utils.loads(response.content))
         except requests.RequestException as e:
             logger.error(f"Error occurred: {str(e)}")
             raise self._handle_error(e)
@@ -187,24 +251,27 @@ class API(BaseAPI):
             "input": {
                 "messages": messages
             },
-            "parameters": {
-                "result_format": "message"
-            }
+            "parameters": self._BASE_PARAMETERS
         }
 
-        for param in ['temperature', 'top_p', 'top_k', 'repetition_penalty', 'max_tokens', 'stop', 'seed',
-                      'enable_search']:
-            if param in kwargs:
-                payload['parameters'][param] = kwargs[param]
+        if not kwargs:
+            return payload
+
+        # Copy-on-write: the shared template must not be mutated.
+        parameters = payload['parameters'] = dict(self._BASE_PARAMETERS)
+        # One C-level set intersection instead of a membership test per
+        # optional parameter.
+        for param in self._OPTIONAL_PARAMS & kwargs.keys():
+            parameters[param] = kwargs[param]
 
         if 'system' in kwargs:
             payload['input']['system'] = kwargs['system']
 
         if 'tools' in kwargs:
-            payload['parameters']['tools'] = kwargs['tools']
+            parameters['tools'] = kwargs['tools']
 
         if 'tool_choice' in kwargs:
-            payload['parameters']['tool_choice'] = kwargs['tool_choice']
+            parameters['tool_choice'] = kwargs['tool_choice']
 
         logger.debug(f"Prepared payload: {json.dumps(payload, indent=2)}")
         return payload
@@ -250,16 +317,47 @@ class API(BaseAPI):
             Dict: Parsed JSON data from each line of the stream.
         """
         logger.debug("Entering _handle_stream_response")
-        for line in response.iter_lines():
-            if line:
-                logger.debug(f"Received line: {line.decode('utf-8')}")
-                line = line.decode('utf-8')
-                if line.startswith('data:'):
-                    data = json.loads(line[5:])
-                    logger.debug(f"Parsed data: {json.dumps(data, indent=2)}")
-                    yield self._handle_response(data)
+        # Lines stay as bytes end to end: the prefix check and slice happen
+        # before any decode, and json_utils.loads accepts bytes directly.
+        for line in self._iter_stream_lines(response, self.STREAM_CHUNK_SIZE):
+            if not line or not line.startswith(b'data:'):
+                continue
+            data = json_utils.loads(line[5:])
+            logger.debug("Parsed data: %r", data)
+            yield self._handle_response(data)
         logger.debug("Exiting _handle_stream_response")
 
+    @staticmethod
+    def _iter_stream_lines(response, chunk_size: int = STREAM_CHUNK_SIZE) -> Generator:
+        """
+        Yield complete lines from a streaming response as soon as they arrive.
+
+        Accumulates raw chunks in a single bytearray and slices each line out
+        the moment its newline is seen, so an event is emitted as soon as it
+        is complete instead of going through iter_lines' internal rebuffering.
+
+        Args:
+            response (requests.Response): The streaming response object.
+            chunk_size (int): Maximum bytes pulled per socket read.
+
+        Yields:
+            bytes: One line per iteration, without the trailing newline.
+        """
+        buf = bytearray()
+        for chunk in response.raw.stream(chunk_size, decode_content=True):
+            buf.extend(chunk)
+            start = 0
+            while (idx := buf.find(b'\n', start)) != -1:
+                line = bytes(buf[start:idx])
+                if line.endswith(b'\r'):
+                    line = line[:-1]
+                start = idx + 1
+                yield line
+            if start:
+                del buf[:start]
+        if buf:
+            yield bytes(buf)
+
     def _handle_error(self, error: requests.RequestException) -> InvokeError:
         """
         Handle errors from API requests.
@@ -270,27 +368,16 @@ class API(BaseAPI):
         Returns:
             InvokeError: An appropriate InvokeError subclass based on the type of error.
         """
-        if isinstance(error, requests.ConnectionError):
-            logger.error(f"Connection error: {str(error)}")
-            return InvokeConnectionError(str(error))
-        elif isinstance(error, requests.Timeout):
-            logger.error(f"Timeout error: {str(error)}")
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            logger.error("Connection error: %s", error)
             return InvokeConnectionError(str(error))
         elif isinstance(error, requests.HTTPError):
-            if error.response.status_code == 429:
-                logger.error(f"Rate limit error: {str(error)}")
-                return InvokeRateLimitError(str(error))
-            elif error.response.status_code in (401, 403):
-                logger.error(f"Authorization error: {str(error)}")
-                return InvokeAuthorizationError(str(error))
-            elif error.response.status_code >= 500:
-                logger.error(f"Server unavailable error: {str(error)}")
-                return InvokeServerUnavailableError(str(error))
-            else:
-                logger.error(f"Bad request error: {str(error)}")
-                return InvokeBadRequestError(str(error))
+            # Table-driven status dispatch shared with the other providers.
+            mapped = map_http_error(error.response.status_code, str(error))
+            logger.error("%s: %s", type(mapped).__name__, error)
+            return mapped
         else:
-            logger.error(f"Unknown error: {str(error)}")
+            logger.error("Unknown error: %s", error)
             return InvokeError(str(error))
 
     def set_proxy(self, proxy_url: str):
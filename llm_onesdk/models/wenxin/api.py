@@ -1,17 +1,47 @@
-from ..base_api import BaseAPI, provider_specific
+from ..base_api import BaseAPI, provider_specific, map_http_error
 from typing import List, Dict, Union, Generator
+import hashlib
+import logging
+import re
 import requests
 import json
 import os
+import time
+from urllib3.util.retry import Retry
+from ...utils import json_utils
 from ...utils.logger import logger
 from ...utils.error_handler import InvokeError, InvokeConnectionError, InvokeRateLimitError, InvokeAuthorizationError, \
-    InvokeBadRequestError
+    InvokeBadRequestError, InvokeServerUnavailableError
+
+# Whitespace-delimited token scan: findall runs one C-level loop instead of
+# allocating a split list per message.
+_WS_RE = re.compile(r'\S+')
+
+def _text_content(content) -> str:
+    """Extract the text of a message content field for token estimation.
+
+    Multimodal content arrives as a list of part dicts; only their text
+    parts should be counted, not the dict syntax of stringified parts.
+    """
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return ' '.join(part.get('text', '') for part in content if isinstance(part, dict))
+    return str(content)
 
 class API(BaseAPI):
     """API class for interacting with the Wenxin (Baidu) API."""
 
     BASE_URL = "https://aip.baidubce.com"
 
+    # SSE frames are typically 1-4 KB; reading 64 KB per socket call
+    # amortizes the kernel-to-user copies across many frames.
+    STREAM_CHUNK_SIZE = 65536
+
+    # Where access tokens are persisted between processes, so short-lived
+    # CLI runs skip the OAuth round-trip while the token is still valid.
+    TOKEN_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "onesdk")
+
     def __init__(self, credentials: Dict[str, str]):
         """
         Initialize the Wenxin API client.
@@ -26,12 +56,33 @@ class API(BaseAPI):
             raise ValueError(
                 "API key and secret key must be provided either in credentials or as environment variables WENXIN_API_KEY and WENXIN_SECRET_KEY")
         self.base_url = credentials.get("api_url", self.BASE_URL)
-        self.access_token = self._get_access_token()
-        self.session = requests.Session()
+        # Reuse the session the base class created; replacing it here would
+        # throw away its connection pool.
         self.session.headers.update({
             'Content-Type': 'application/json',
-            'Accept': 'application/json'
+            'Accept': 'application/json',
+            'Connection': 'keep-alive'
         })
+        # Enlarge the keep-alive pool beyond requests' default of 10 and
+        # retry transient gateway failures at the connection layer, so
+        # threaded fan-out is not silently throttled by the pool.
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=["POST", "GET"],
+            respect_retry_after_header=True,
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=20, pool_maxsize=20, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Endpoint -> full URL memo; the token is baked into each entry and
+        # the cache is cleared whenever the token is refreshed.
+        self._url_cache = {}
+        # Fetched after the session is configured so the OAuth round-trip
+        # reuses the same pooled connection.
+        self.access_token = self._get_access_token()
 
         # Default model endpoint mappings
         self.model_endpoints = {
@@ -40,18 +91,48 @@ class API(BaseAPI):
             "BLOOMZ-7B": "/rpc/2.0/ai_custom/v1/wenxinworkshop/chat/bloomz_7b1"
         }
 
+        # Built once; _call_api picks this by reference instead of copying
+        # the session headers per streaming request.
+        self._stream_headers = {'Accept': 'text/event-stream'}
         logger.info("Wenxin API initialized")
 
-    def _get_access_token(self) -> str:
+    def _token_cache_path(self) -> str:
+        """Return the per-credential path of the persisted token file."""
+        digest = hashlib.sha256(self.api_key.encode()).hexdigest()
+        return os.path.join(self.TOKEN_CACHE_DIR, f"wenxin_token_{digest}.json")
+
+    def _get_access_token(self, force_refresh: bool = False) -> str:
         """
         Get the access token for API authentication.
 
+        A token persisted by a previous run is reused while it has more than
+        the refresh margin left; otherwise the OAuth endpoint is called and
+        the fresh token is written back atomically. The expiry is also
+        recorded so the base class can refresh it in the background before
+        any request would fail.
+
+        Args:
+            force_refresh (bool): Skip the persisted token and fetch a new one.
+
         Returns:
             str: The access token.
 
         Raises:
             InvokeError: If there's an error getting the access token.
         """
+        cache_path = self._token_cache_path()
+        if not force_refresh:
+            try:
+                with open(cache_path) as f:
+                    cached = json.load(f)
+                remaining = cached["expires_at"] - time.time()
+                if remaining > self.TOKEN_REFRESH_MARGIN:
+                    self._token_expiry = time.monotonic() + remaining
+                    logger.debug("Reusing persisted access token")
+                    return cached["access_token"]
+            except (OSError, ValueError, KeyError):
+                pass
+
         url = f"{self.base_url}/oauth/2.0/token"
         params = {
             "grant_type": "client_credentials",
@@ -59,7 +140,7 @@ class API(BaseAPI):
             "client_secret": self.secret_key
         }
         try:
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             response_body = response.text
             try:
                 response_json = response.json()
@@ -67,13 +148,32 @@ class API(BaseAPI):
                 response_json = {}
 
             response.raise_for_status()
-            return response_json.get("access_token")
+            token = response_json.get("access_token")
+            expires_in = response_json.get("expires_in", 2592000)
+            self._token_expiry = time.monotonic() + expires_in
+            try:
+                # The token is a bearer-equivalent credential: keep the cache
+                # directory and file readable by the owner only.
+                os.makedirs(self.TOKEN_CACHE_DIR, mode=0o700, exist_ok=True)
+                tmp_path = cache_path + ".tmp"
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, "w") as f:
+                    json.dump({"access_token": token, "expires_at": time.time() + expires_in}, f)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                logger.debug(f"Could not persist access token: {str(e)}")
+            return token
         except requests.RequestException as e:
             error_message = f"Error getting access token: {str(e)}\nResponse body: {response_body}"
             logger.error(error_message)
             logger.error(f"Response JSON: {json.dumps(response_json, indent=2, ensure_ascii=False)}")
             raise self._handle_error(e, additional_info=error_message)
 
+    def refresh_credentials(self):
+        """Re-acquire the access token; run by the base class near expiry."""
+        self.access_token = self._get_access_token(force_refresh=True)
+        self._url_cache.clear()
+
     @provider_specific
     def set_custom_model(self, model_name: str, endpoint: str):
         """
@@ -84,7 +184,7 @@ class API(BaseAPI):
             endpoint (str): The API endpoint for the custom model.
         """
         self.model_endpoints[model_name] = endpoint
-        logger.info(f"Custom model '{model_name}' set with endpoint: {endpoint}")
+        logger.info("Custom model %r set with endpoint: %s", model_name, endpoint)
 
     def _get_endpoint(self, model: str) -> str:
         """
@@ -118,7 +218,7 @@ class API(BaseAPI):
             Dict: The generated response.
         """
         endpoint = self._get_endpoint(model)
-        logger.info(f"Generating response with model: {model}")
+        logger.info("Generating response with model: %s", model)
         return self._call_api(endpoint, model, messages, stream=False, **kwargs)
 
     def stream_generate(self, model: str, messages: List[Dict[str, Union[str, List[Dict[str, str]]]]],
@@ -135,7 +235,7 @@ class API(BaseAPI):
             Generator: A generator yielding response chunks.
         """
         endpoint = self._get_endpoint(model)
-        logger.info(f"Generating streaming response with model: {model}")
+        logger.info("Generating streaming response with model: %s", model)
         yield from self._call_api(endpoint, model, messages, stream=True, **kwargs)
 
     def _call_api(self, endpoint: str, model: str, messages: List[Dict], stream: bool = False, **kwargs):
@@ -155,31 +255,47 @@ class API(BaseAPI):
         Raises:
             InvokeError: If there's an error during the API call.
         """
-        url = f"{self.base_url}{endpoint}?access_token={self.access_token}"
+        self._maybe_schedule_refresh()
         payload = self._prepare_payload(model, messages, stream, **kwargs)
-        headers = self.session.headers.copy()
-        if stream:
-            headers['Accept'] = 'text/event-stream'
-
-        logger.debug(f"Sending request to {url}")
-        logger.debug(f"Headers: {headers}")
-        logger.debug(f"Payload: {json.dumps(payload, indent=2)}")
-
-        try:
-            response = self.session.post(url, json=payload, headers=headers, stream=stream)
-            response.raise_for_status()
-
-            if stream:
-                logger.debug("Received streaming response")
-                return self._handle_stream_response(response)
-            else:
-                logger.debug("Received non-streaming response")
-                response_json = response.json()
-                logger.debug(f"Raw API response: {json.dumps(response_json, indent=2)}")
-                return self._handle_response(response_json)
-        except requests.RequestException as e:
-            logger.error(f"Error occurred: {str(e)}")
-            raise self._handle_error(e)
+        # The session already carries the default headers; only the streaming
+        # Accept override is passed per request, picked by reference instead
+        # of copying the header dict on every call.
+        headers = self._stream_headers if stream else None
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Payload: %s", json.dumps(payload, indent=2))
+        # Serialize the body once up front with the faster json_utils backend
+        # instead of letting requests re-run stdlib json on each attempt.
+        body = json_utils.dumps_bytes(payload)
+
+        for attempt in (0, 1):
+            # Memoized per endpoint; a token refresh clears the cache, so a
+            # retry after a 401 picks up the new token.
+            url = self._url_cache.get(endpoint)
+            if url is None:
+                url = self._url_cache[endpoint] = f"{self.base_url}{endpoint}?access_token={self.access_token}"
+            logger.debug("Sending request to %s", url)
+            try:
+                response = self.session.post(url, data=body, headers=headers, stream=stream)
+                response.raise_for_status()
+
+                if stream:
+                    logger.debug("Received streaming response")
+                    return self._handle_stream_response(response)
+                else:
+                    logger.debug("Received non-streaming response")
+                    response_json = json_utils.loads(response.content)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Raw API response: %s", json.dumps(response_json, indent=2))
+                    return self._handle_response(response_json)
+            except requests.RequestException as e:
+                if (attempt == 0 and isinstance(e, requests.HTTPError)
+                        and e.response is not None and e.response.status_code == 401):
+                    logger.info("Access token rejected; refreshing and retrying once")
+                    self.refresh_credentials()
+                    continue
+                logger.error("Error occurred: %s", e)
+                raise self._handle_error(e)
 
     def _prepare_payload(self, model: str, messages: List[Dict], stream: bool, **kwargs):
         """
@@ -203,7 +319,8 @@ class API(BaseAPI):
             if param in kwargs:
                 payload[param] = kwargs[param]
 
-        logger.debug(f"Prepared payload: {json.dumps(payload, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Prepared payload: %s", json.dumps(payload, indent=2))
         return payload
 
     def _handle_response(self, response_data: Dict) -> Dict:
@@ -233,7 +350,8 @@ class API(BaseAPI):
                 'finish_reason': 'error'
             }]
 
-        logger.debug(f"Handled response: {json.dumps(result, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Handled response: %s", json.dumps(result, indent=2))
         return result
 
     def _handle_stream_chunk(self, chunk_data: Dict) -> Dict:
@@ -258,7 +376,8 @@ class API(BaseAPI):
             }],
             'usage': chunk_data.get('usage', {})
         }
-        logger.debug(f"Handled stream chunk: {json.dumps(result, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Handled stream chunk: %s", json.dumps(result, indent=2))
         return result
 
     def _handle_stream_response(self, response) -> Generator:
@@ -272,16 +391,47 @@ class API(BaseAPI):
             Dict: Parsed JSON data from each line of the stream.
         """
         logger.debug("Entering _handle_stream_response")
-        for line in response.iter_lines():
-            if line:
-                logger.debug(f"Received line: {line.decode('utf-8')}")
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    data = json.loads(line[6:])
-                    logger.debug(f"Parsed data: {json.dumps(data, indent=2)}")
-                    yield self._handle_stream_chunk(data)
+        # Lines stay as bytes end to end: the prefix check and slice happen
+        # before any decode, and json_utils.loads accepts bytes directly.
+        for line in self._iter_stream_lines(response, self.STREAM_CHUNK_SIZE):
+            if not line or not line.startswith(b'data: '):
+                continue
+            data = json_utils.loads(line[6:])
+            logger.debug("Parsed data: %r", data)
+            yield self._handle_stream_chunk(data)
         logger.debug("Exiting _handle_stream_response")
 
+    @staticmethod
+    def _iter_stream_lines(response, chunk_size: int = STREAM_CHUNK_SIZE) -> Generator:
+        """
+        Yield complete lines from a streaming response as soon as they arrive.
+
+        Accumulates raw chunks in a single bytearray and slices each line out
+        the moment its newline is seen, so an event is emitted as soon as it
+        is complete instead of going through iter_lines' internal rebuffering.
+
+        Args:
+            response (requests.Response): The streaming response object.
+            chunk_size (int): Maximum bytes pulled per socket read.
+
+        Yields:
+            bytes: One line per iteration, without the trailing newline.
+        """
+        buf = bytearray()
+        for chunk in response.raw.stream(chunk_size, decode_content=True):
+            buf.extend(chunk)
+            start = 0
+            while (idx := buf.find(b'\n', start)) != -1:
+                line = bytes(buf[start:idx])
+                if line.endswith(b'\r'):
+                    line = line[:-1]
+                start = idx + 1
+                yield line
+            if start:
+                del buf[:start]
+        if buf:
+            yield bytes(buf)
+
     def _handle_error(self, error: requests.RequestException, additional_info: str = "") -> InvokeError:
         """
         Handle errors from API requests.
@@ -294,27 +444,16 @@ class API(BaseAPI):
             InvokeError: An appropriate InvokeError subclass based on the type of error.
         """
         error_message = f"{str(error)}\n{additional_info}"
-        if isinstance(error, requests.ConnectionError):
-            logger.error(f"Connection error: {error_message}")
-            return InvokeConnectionError(error_message)
-        elif isinstance(error, requests.Timeout):
-            logger.error(f"Timeout error: {error_message}")
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            logger.error("Connection error: %s", error_message)
             return InvokeConnectionError(error_message)
         elif isinstance(error, requests.HTTPError):
-            if error.response.status_code == 429:
-                logger.error(f"Rate limit error: {error_message}")
-                return InvokeRateLimitError(error_message)
-            elif error.response.status_code in (401, 403):
-                logger.error(f"Authorization error: {error_message}")
-                return InvokeAuthorizationError(error_message)
-            elif error.response.status_code >= 500:
-                logger.error(f"Server unavailable error: {error_message}")
-                return InvokeServerUnavailableError(error_message)
-            else:
-                logger.error(f"Bad request error: {error_message}")
-                return InvokeBadRequestError(error_message)
+            # Table-driven status dispatch shared with the other providers.
+            mapped = map_http_error(error.response.status_code, error_message)
+            logger.error("%s: %s", type(mapped).__name__, error_message)
+            return mapped
         else:
-            logger.error(f"Unknown error: {error_message}")
+            logger.error("Unknown error: %s", error_message)
             return InvokeError(error_message)
 
     def count_tokens(self, model: str, messages: List[Dict[str, Union[str, List[Dict[str, str]]]]]) -> int:
@@ -328,8 +467,9 @@ class API(BaseAPI):
         Returns:
             int: The estimated number of tokens in the messages.
         """
-        token_count = sum(len(str(message.get('content', '')).split()) for message in messages)
-        logger.info(f"Estimated token count for model {model}: {token_count}")
+        buf = '\n'.join(_text_content(message.get('content', '')) for message in messages)
+        token_count = len(_WS_RE.findall(buf))
+        logger.info("Estimated token count for model %s: %d", model, token_count)
         return token_count
 
     def set_proxy(self, proxy_url: str):
@@ -343,4 +483,4 @@ class API(BaseAPI):
             'http': proxy_url,
             'https': proxy_url
         }
-        logger.info(f"Proxy set to {proxy_url}")
\ No newline at end of file
+        logger.info("Proxy set to %s", proxy_url)
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+A small thread-safe TTL + LRU cache for idempotent provider GET responses.
+
+Listing models, caches, tags or files repeatedly within a short window costs
+a full network round-trip each time even though the answers rarely change.
+Provider APIs route those GETs through a TTLCache so a repeat call within
+the TTL is served from memory. Expired entries are kept (up to maxsize) so
+callers can opt into returning a stale value when the upstream is down.
+
+The standard library has no TTL cache and cachetools is not a dependency,
+so this is a minimal OrderedDict-based implementation.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Map of key -> value with per-entry expiry and least-recently-used eviction.
+
+    Args:
+        maxsize (int): Maximum number of entries kept, fresh or stale.
+        ttl (float): Default lifetime of an entry in seconds.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expiry, value = entry
+            if time.monotonic() >= expiry:
+                # Keep the entry for get_stale; it is evicted by LRU order.
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key even if expired, or None if absent."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None else None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value under key, evicting the least-recently-used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable = None):
+        """Drop one entry, or every entry when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -1,5 +1,22 @@
 from typing import Optional, Dict, Any, Type
 
+__all__ = [
+    "InvokeError",
+    "InvokeConnectionError",
+    "InvokeServerUnavailableError",
+    "InvokeRateLimitError",
+    "InvokeAuthorizationError",
+    "InvokeBadRequestError",
+    "InvokeTimeoutError",
+    "InvokeAPIError",
+    "InvokeModelNotFoundError",
+    "InvokeInvalidParameterError",
+    "InvokeUnsupportedOperationError",
+    "InvokeConfigError",
+    "handle_api_error",
+    "InvokeErrorType",
+]
+
 class InvokeError(Exception):
     """Base class for all invoke errors."""
 
@@ -27,6 +44,9 @@ class InvokeError(Exception):
         Returns:
             str: A formatted string containing error details.
         """
+        # Most errors carry only a message; skip the list+join in that case.
+        if self.error_code is None and self.http_status is None and not self.details:
+            return self.message
         error_parts: list[str] = [f"Error {self.error_code}: {self.message}" if self.error_code else self.message]
         if self.http_status:
             error_parts.append(f"HTTP Status: {self.http_status}")
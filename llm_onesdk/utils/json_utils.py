@@ -0,0 +1,44 @@
+"""
+JSON helpers shared by the provider API modules.
+
+Serialization and SSE parsing sit on the request hot path, so this module
+prefers a C-accelerated backend (orjson, then ujson) when one is installed
+and falls back to the standard library otherwise. Either way it exposes the
+same two callables:
+
+    dumps_bytes(obj) -> bytes: serialize to UTF-8 encoded JSON bytes.
+    loads(data) -> Any: parse JSON from str or bytes.
+
+Install the optional backend with `pip install llm_onesdk[fast]`.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+if orjson is not None:
+    def dumps_bytes(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    loads = orjson.loads
+elif ujson is not None:
+    def dumps_bytes(obj) -> bytes:
+        return ujson.dumps(obj).encode('utf-8')
+
+    loads = ujson.loads
+else:
+    def dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+    loads = json.loads
+
+# Exceptions raised by loads() on malformed input, for use in except clauses.
+# orjson and ujson both raise ValueError subclasses, as does json.JSONDecodeError.
+JSONDecodeError = ValueError
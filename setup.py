@@ -23,6 +23,7 @@ setup(
     ],
     extras_require={
         "test": ["unittest2>=1.1.0"],
+        "fast": ["orjson>=3.6", "msgspec>=0.18", "brotli>=1.0", "zstandard>=0.18"],
     },
     project_urls={
         "GitHub": "https://github.com/LLMPages/onesdk",
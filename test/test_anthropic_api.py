@@ -3,7 +3,6 @@ import sys
 import unittest
 from typing import Dict
 import time
-from unittest.mock import patch
 
 # 添加项目根目录到 Python 路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -12,6 +11,37 @@ from llm_onesdk.core import OneSDK
 from llm_onesdk.utils.error_handler import InvokeError, InvokeConnectionError, InvokeRateLimitError, InvokeAuthorizationError
 from llm_onesdk.utils.logger import Logger, logger
 
+# 只有设置 ONESDK_LIVE_TESTS=1 时才运行真实网络测试
+LIVE_TESTS = bool(os.environ.get("ONESDK_LIVE_TESTS"))
+
+
+class RateLimiter:
+    """令牌桶限流器：只在真正会超出速率时才休眠，而不是每个测试固定等待。"""
+
+    def __init__(self, rate_per_sec: float):
+        self.rate = rate_per_sec
+        self.tokens = rate_per_sec
+        self.ts = time.monotonic()
+
+    def acquire(self):
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.ts) * self.rate)
+        self.ts = now
+        if self.tokens < 1:
+            time.sleep((1 - self.tokens) / self.rate)
+            self.tokens = 0
+        else:
+            self.tokens -= 1
+
+
+_RATE_LIMITER = RateLimiter(1.0)
+
+# 只有这些测试会访问真实 API，其余是 mock 测试，不需要限流
+_NETWORK_TESTS = frozenset({
+    "test_list_models", "test_get_model", "test_generate",
+    "test_stream_generate", "test_count_tokens",
+})
+
 class TestAnthropicAPI(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -19,21 +49,32 @@ class TestAnthropicAPI(unittest.TestCase):
         logger.info("Setting up TestAnthropicAPI class")
 
         cls.api_key = os.environ.get("ANTHROPIC_API_KEY")
-        if not cls.api_key:
+        if LIVE_TESTS and not cls.api_key:
             raise ValueError("Please set ANTHROPIC_API_KEY environment variable")
+        if not cls.api_key:
+            # 模拟测试不需要真实密钥
+            cls.api_key = "test-key"
 
         cls.base_url = os.environ.get("ANTHROPIC_URL")
-        cls.sdk = OneSDK("anthropic", {
-            "api_key": cls.api_key,
-            "api_url": cls.base_url
-        })
+        credentials = {"api_key": cls.api_key}
+        if cls.base_url:
+            credentials["api_url"] = cls.base_url
+        cls.sdk = OneSDK("anthropic", credentials)
         cls.sdk.set_debug_mode(True)
 
         cls.default_model = "claude-3-5-sonnet-20241022"
 
+        # 各用例共用同一消息对象，避免重复构造字典字面量
+        cls.count_messages = [{"role": "user", "content": "Count from 1 to 5."}]
+
+    # 该 Provider 的会话是进程级共享单例（见 base_api.get_shared_session），
+    # 测试类并不拥有它，这里不在 tearDownClass 中关闭。
+
     def setUp(self):
-        time.sleep(1)  # 添加延迟以避免频率限制
+        if LIVE_TESTS and self._testMethodName in _NETWORK_TESTS:
+            _RATE_LIMITER.acquire()  # 仅在超出速率时休眠，避免固定延迟
 
+    @unittest.skipUnless(LIVE_TESTS, "set ONESDK_LIVE_TESTS=1 to run live API tests")
     def test_list_models(self):
         logger.info("\nTesting list_models for Anthropic:")
         models = self.sdk.list_models()
@@ -41,11 +82,15 @@ class TestAnthropicAPI(unittest.TestCase):
         self.assertTrue(len(models) > 0)
         logger.info(f"Anthropic models: {models}")
 
+    @unittest.skipUnless(LIVE_TESTS, "set ONESDK_LIVE_TESTS=1 to run live API tests")
     def test_base_url(self):
         logger.info("\nTesting base URL for Anthropic:")
-        self.assertEqual(self.sdk.api.base_url, self.base_url)
-        logger.info(f"Base URL correctly set to: {self.base_url}")
+        # 未设置 ANTHROPIC_URL 时应回退到内置默认地址
+        expected = self.base_url or self.sdk.api.BASE_URL
+        self.assertEqual(self.sdk.api.base_url, expected)
+        logger.info(f"Base URL correctly set to: {expected}")
 
+    @unittest.skipUnless(LIVE_TESTS, "set ONESDK_LIVE_TESTS=1 to run live API tests")
     def test_get_model(self):
         logger.info("\nTesting get_model for Anthropic:")
         model_info = self.sdk.get_model(self.default_model)
@@ -53,39 +98,44 @@ class TestAnthropicAPI(unittest.TestCase):
         self.assertEqual(model_info['id'], self.default_model)
         logger.info(f"Anthropic model info: {model_info}")
 
+    @unittest.skipUnless(LIVE_TESTS, "set ONESDK_LIVE_TESTS=1 to run live API tests")
     def test_generate(self):
         logger.info("\nTesting generate for Anthropic:")
-        messages = [{"role": "user", "content": "Count from 1 to 5."}]
+        messages = self.count_messages
         response = self.sdk.generate(self.default_model, messages, max_tokens=100)
         self.assertIsInstance(response, Dict)
         self.assertIn('content', response)
         logger.info(f"Anthropic response: {response['content']}")
 
+    @unittest.skipUnless(LIVE_TESTS, "set ONESDK_LIVE_TESTS=1 to run live API tests")
     def test_stream_generate(self):
         logger.info("\nTesting stream_generate for Anthropic:")
-        messages = [{"role": "user", "content": "Count from 1 to 5."}]
+        messages = self.count_messages
         stream = self.sdk.stream_generate(model=self.default_model, messages=messages, max_tokens=100)
-        full_response = ""
+        parts = []
         chunk_count = 0
-        start_time = time.time()
-        timeout = 30  # 30 seconds timeout
+        monotonic = time.monotonic  # 局部变量，避免每个 chunk 做属性查找
+        start_time = monotonic()
+        deadline = start_time + 30  # 30 seconds timeout
         for chunk in stream:
-            if time.time() - start_time > timeout:
+            if monotonic() > deadline:
                 logger.warning("Timeout reached for Anthropic")
                 break
             chunk_count += 1
             self.assertIsInstance(chunk, Dict)
-            logger.info(f"Received chunk {chunk_count}: {chunk}")
+            logger.info("Received chunk %d: %s", chunk_count, chunk)
             content = chunk.get('delta', {}).get('text', '')
             if content:
-                full_response += content
-                logger.info(f"Content: {content}")
+                parts.append(content)
+                logger.info("Content: %s", content)
+        full_response = "".join(parts)  # 一次性拼接，避免二次方的字符串增长
         logger.info(f"\nAnthropic full response: {full_response}")
         logger.info(f"Total chunks received: {chunk_count}")
-        logger.info(f"Time taken: {time.time() - start_time:.2f} seconds")
+        logger.info(f"Time taken: {monotonic() - start_time:.2f} seconds")
         self.assertTrue(chunk_count > 0, "No chunks were received")
         self.assertTrue(len(full_response) > 0, "No content was received")
 
+    @unittest.skipUnless(LIVE_TESTS, "set ONESDK_LIVE_TESTS=1 to run live API tests")
     def test_count_tokens(self):
         logger.info("\nTesting count_tokens for Anthropic:")
         messages = [
@@ -97,27 +147,30 @@ class TestAnthropicAPI(unittest.TestCase):
         self.assertTrue(token_count > 0)
         logger.info(f"Anthropic token count: {token_count}")
 
-    @patch.object(OneSDK, 'generate')
-    def test_error_handling_generate(self, mock_generate):
-        mock_generate.side_effect = InvokeError("Test error")
+    def _raise_on_generate(self, exc):
+        """让 generate 直接抛出给定异常，避免构建 MagicMock 的开销。"""
+        def fail(*args, **kwargs):
+            raise exc
+        self.sdk.generate = fail
+        self.addCleanup(self.sdk.__dict__.pop, 'generate', None)
+
+    def test_error_handling_generate(self):
+        self._raise_on_generate(InvokeError("Test error"))
         with self.assertRaises(InvokeError):
             self.sdk.generate(self.default_model, [{"role": "user", "content": "Test"}])
 
-    @patch.object(OneSDK, 'generate')
-    def test_connection_error(self, mock_generate):
-        mock_generate.side_effect = InvokeConnectionError("Connection error")
+    def test_connection_error(self):
+        self._raise_on_generate(InvokeConnectionError("Connection error"))
         with self.assertRaises(InvokeConnectionError):
             self.sdk.generate(self.default_model, [{"role": "user", "content": "Test"}])
 
-    @patch.object(OneSDK, 'generate')
-    def test_rate_limit_error(self, mock_generate):
-        mock_generate.side_effect = InvokeRateLimitError("Rate limit exceeded")
+    def test_rate_limit_error(self):
+        self._raise_on_generate(InvokeRateLimitError("Rate limit exceeded"))
         with self.assertRaises(InvokeRateLimitError):
             self.sdk.generate(self.default_model, [{"role": "user", "content": "Test"}])
 
-    @patch.object(OneSDK, 'generate')
-    def test_authorization_error(self, mock_generate):
-        mock_generate.side_effect = InvokeAuthorizationError("Invalid API key")
+    def test_authorization_error(self):
+        self._raise_on_generate(InvokeAuthorizationError("Invalid API key"))
         with self.assertRaises(InvokeAuthorizationError):
             self.sdk.generate(self.default_model, [{"role": "user", "content": "Test"}])
 
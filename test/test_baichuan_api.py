@@ -26,14 +26,20 @@ class TestBaichuanAPI(unittest.TestCase):
         cls.sdk.set_debug_mode(True)
 
         cls.chat_model = "Baichuan2-53B"
+
+        # 各用例共用同一消息对象，避免重复构造字典字面量
+        cls.count_messages = [{"role": "user", "content": "Count from 1 to 5."}]
         cls.embedding_model = "Baichuan-Text-Embedding"
 
+    # 该 Provider 的会话是进程级共享单例（见 base_api.get_shared_session），
+    # 测试类并不拥有它，这里不在 tearDownClass 中关闭。
+
     def setUp(self):
         time.sleep(1)  # 添加延迟以避免频率限制
 
     def test_generate(self):
         logger.info("\nTesting generate for Baichuan:")
-        messages = [{"role": "user", "content": "Count from 1 to 5."}]
+        messages = self.count_messages
         response = self.sdk.generate(self.chat_model, messages)
         self.assertIsInstance(response, Dict)
         self.assertIn('choices', response)
@@ -42,14 +48,15 @@ class TestBaichuanAPI(unittest.TestCase):
 
     def test_stream_generate(self):
         logger.info("\nTesting stream_generate for Baichuan:")
-        messages = [{"role": "user", "content": "Count from 1 to 5."}]
+        messages = self.count_messages
         stream = self.sdk.stream_generate(model=self.chat_model, messages=messages)
-        full_response = ""
+        parts = []
         chunk_count = 0
-        start_time = time.time()
-        timeout = 30  # 30 seconds timeout
+        monotonic = time.monotonic  # 局部变量，避免每个 chunk 做属性查找
+        start_time = monotonic()
+        deadline = start_time + 30  # 30 seconds timeout
         for chunk in stream:
-            if time.time() - start_time > timeout:
+            if monotonic() > deadline:
                 logger.warning("Timeout reached for Baichuan")
                 break
             chunk_count += 1
@@ -58,11 +65,12 @@ class TestBaichuanAPI(unittest.TestCase):
             self.assertIn('delta', chunk['choices'][0])
             content = chunk['choices'][0]['delta'].get('content', '')
             if content:
-                full_response += content
-                logger.info(f"Baichuan chunk {chunk_count}: {content}")
+                parts.append(content)
+                logger.info("Baichuan chunk %d: %s", chunk_count, content)
+        full_response = "".join(parts)  # 一次性拼接，避免二次方的字符串增长
         logger.info(f"\nBaichuan full response: {full_response}")
         logger.info(f"Total chunks received: {chunk_count}")
-        logger.info(f"Time taken: {time.time() - start_time:.2f} seconds")
+        logger.info(f"Time taken: {monotonic() - start_time:.2f} seconds")
 
     def test_create_embedding_single(self):
         logger.info("\nTesting create_embedding (single input) for Baichuan:")
@@ -89,9 +97,15 @@ class TestBaichuanAPI(unittest.TestCase):
         logger.info(f"Baichuan embeddings: {[item['embedding'][:5] for item in response['data']]}")
         logger.info(f"Usage: {response['usage']}")
 
-    @patch.object(OneSDK, 'generate')
-    def test_error_handling_generate(self, mock_generate):
-        mock_generate.side_effect = InvokeError("Test error")
+    def _raise_on_generate(self, exc):
+        """让 generate 直接抛出给定异常，避免构建 MagicMock 的开销。"""
+        def fail(*args, **kwargs):
+            raise exc
+        self.sdk.generate = fail
+        self.addCleanup(self.sdk.__dict__.pop, 'generate', None)
+
+    def test_error_handling_generate(self):
+        self._raise_on_generate(InvokeError("Test error"))
         with self.assertRaises(InvokeError):
             self.sdk.generate(self.chat_model, [{"role": "user", "content": "Test"}])
 
@@ -3,7 +3,6 @@ import sys
 import unittest
 from typing import List, Dict
 import time
-from unittest.mock import patch
 
 # 添加项目根目录到 Python 路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -27,6 +26,12 @@ class TestDoubaoAPI(unittest.TestCase):
 
         cls.default_model = "ep-20241225233943-vkjxr"  # 使用正确的 tokenization 模型
 
+        # 各用例共用同一消息对象，避免重复构造字典字面量
+        cls.count_messages = [{"role": "user", "content": "Count from 1 to 5."}]
+
+    # 该 Provider 的会话是进程级共享单例（见 base_api.get_shared_session），
+    # 测试类并不拥有它，这里不在 tearDownClass 中关闭。
+
     def test_count_tokens(self):
         logger.info("\nTesting count_tokens for Doubao:")
         messages = [
@@ -46,7 +51,7 @@ class TestDoubaoAPI(unittest.TestCase):
 
     def test_generate(self):
         logger.info("\nTesting generate for Doubao:")
-        messages = [{"role": "user", "content": "Count from 1 to 5."}]
+        messages = self.count_messages
         try:
             response = self.sdk.generate(self.default_model, messages)
             self.assertIsInstance(response, Dict)
@@ -61,15 +66,16 @@ class TestDoubaoAPI(unittest.TestCase):
 
     def test_stream_generate(self):
         logger.info("\nTesting stream_generate for Doubao:")
-        messages = [{"role": "user", "content": "Count from 1 to 5."}]
+        messages = self.count_messages
         try:
             stream = self.sdk.stream_generate(model=self.default_model, messages=messages)
-            full_response = ""
+            parts = []
             chunk_count = 0
-            start_time = time.time()
-            timeout = 30  # 30 seconds timeout
+            monotonic = time.monotonic  # 局部变量，避免每个 chunk 做属性查找
+            start_time = monotonic()
+            deadline = start_time + 30  # 30 seconds timeout
             for chunk in stream:
-                if time.time() - start_time > timeout:
+                if monotonic() > deadline:
                     logger.warning("Timeout reached for Doubao")
                     break
                 chunk_count += 1
@@ -78,11 +84,12 @@ class TestDoubaoAPI(unittest.TestCase):
                 self.assertIn('message', chunk['choices'][0])
                 content = chunk['choices'][0]['message'].get('content', '')
                 if content:
-                    full_response += content
-                    logger.info(f"Doubao chunk {chunk_count}: {content}")
+                    parts.append(content)
+                    logger.info("Doubao chunk %d: %s", chunk_count, content)
+            full_response = "".join(parts)  # 一次性拼接，避免二次方的字符串增长
             logger.info(f"\nDoubao full response: {full_response}")
             logger.info(f"Total chunks received: {chunk_count}")
-            logger.info(f"Time taken: {time.time() - start_time:.2f} seconds")
+            logger.info(f"Time taken: {monotonic() - start_time:.2f} seconds")
         except InvokeUnsupportedOperationError:
             logger.info("Doubao does not support stream generation")
         except Exception as e:
@@ -123,9 +130,15 @@ class TestDoubaoAPI(unittest.TestCase):
             logger.error(f"Unexpected error during tokenize for Doubao: {str(e)}")
             self.fail(f"Unexpected error during tokenize for Doubao: {str(e)}")
 
-    @patch.object(OneSDK, 'generate')
-    def test_error_handling(self, mock_generate):
-        mock_generate.side_effect = InvokeError("Test error")
+    def _raise_on_generate(self, exc):
+        """让 generate 直接抛出给定异常，避免构建 MagicMock 的开销。"""
+        def fail(*args, **kwargs):
+            raise exc
+        self.sdk.generate = fail
+        self.addCleanup(self.sdk.__dict__.pop, 'generate', None)
+
+    def test_error_handling(self):
+        self._raise_on_generate(InvokeError("Test error"))
         with self.assertRaises(InvokeError):
             self.sdk.generate(self.default_model, [{"role": "user", "content": "Test"}])
 
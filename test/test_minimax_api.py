@@ -3,7 +3,6 @@ import sys
 import unittest
 from typing import List, Dict
 import time
-from unittest.mock import patch
 import io
 
 # 添加项目根目录到 Python 路径
@@ -33,12 +32,20 @@ class TestMiniMaxAPI(unittest.TestCase):
 
         cls.default_model = "abab5.5-chat"  # 使用 MiniMax 的默认模型
 
+        # 各用例共用同一消息对象，避免重复构造字典字面量
+        cls.count_messages = [{"role": "user", "content": "Count from 1 to 5."}]
+
+    @classmethod
+    def tearDownClass(cls):
+        # 释放连接池中的套接字
+        cls.sdk.api.session.close()
+
     def setUp(self):
         time.sleep(1)  # 添加延迟以避免频率限制
 
     def test_generate(self):
         logger.info("\nTesting generate for MiniMax:")
-        messages = [{"role": "user", "content": "Count from 1 to 5."}]
+        messages = self.count_messages
         bot_setting = [{"bot_name": "MM智能助理", "content": "MM智能助理是一款由MiniMax自研的大型语言模型。"}]
         response = self.sdk.generate(self.default_model, messages, bot_setting=bot_setting)
         self.assertIsInstance(response, Dict)
@@ -49,15 +56,16 @@ class TestMiniMaxAPI(unittest.TestCase):
 
     def test_stream_generate(self):
         logger.info("\nTesting stream_generate for MiniMax:")
-        messages = [{"role": "user", "content": "Count from 1 to 5."}]
+        messages = self.count_messages
         bot_setting = [{"bot_name": "MM智能助理", "content": "MM智能助理是一款由MiniMax自研的大型语言模型。"}]
         stream = self.sdk.stream_generate(model=self.default_model, messages=messages, bot_setting=bot_setting)
-        full_response = ""
+        parts = []
         chunk_count = 0
-        start_time = time.time()
-        timeout = 30  # 30 seconds timeout
+        monotonic = time.monotonic  # 局部变量，避免每个 chunk 做属性查找
+        start_time = monotonic()
+        deadline = start_time + 30  # 30 seconds timeout
         for chunk in stream:
-            if time.time() - start_time > timeout:
+            if monotonic() > deadline:
                 logger.warning("Timeout reached for MiniMax")
                 break
             chunk_count += 1
@@ -65,11 +73,12 @@ class TestMiniMaxAPI(unittest.TestCase):
             self.assertIn('delta', chunk)
             content = chunk['delta'].get('text', '')
             if content:
-                full_response += content
-                logger.info(f"MiniMax chunk {chunk_count}: {content}")
+                parts.append(content)
+                logger.info("MiniMax chunk %d: %s", chunk_count, content)
+        full_response = "".join(parts)  # 一次性拼接，避免二次方的字符串增长
         logger.info(f"\nMiniMax full response: {full_response}")
         logger.info(f"Total chunks received: {chunk_count}")
-        logger.info(f"Time taken: {time.time() - start_time:.2f} seconds")
+        logger.info(f"Time taken: {monotonic() - start_time:.2f} seconds")
         self.assertTrue(chunk_count > 0, "No chunks were received")
         self.assertTrue(len(full_response) > 0, "No content was received")
 
@@ -260,10 +269,11 @@ class TestMiniMaxAPI(unittest.TestCase):
         stream = self.sdk.api.stream_chatcompletion_pro(self.default_model, messages)
         full_response = []
         chunk_count = 0
-        start_time = time.time()
-        timeout = 30  # 30 seconds timeout
+        monotonic = time.monotonic  # 局部变量，避免每个 chunk 做属性查找
+        start_time = monotonic()
+        deadline = start_time + 30  # 30 seconds timeout
         for chunk in stream:
-            if time.time() - start_time > timeout:
+            if monotonic() > deadline:
                 logger.warning("Timeout reached for MiniMax")
                 break
             chunk_count += 1
@@ -271,10 +281,10 @@ class TestMiniMaxAPI(unittest.TestCase):
             self.assertIn('delta', chunk)
             delta_content = chunk['delta']
             full_response.extend(delta_content)
-            logger.info(f"MiniMax chunk {chunk_count}: {delta_content}")
+            logger.info("MiniMax chunk %d: %s", chunk_count, delta_content)
         logger.info(f"\nMiniMax full response: {full_response}")
         logger.info(f"Total chunks received: {chunk_count}")
-        logger.info(f"Time taken: {time.time() - start_time:.2f} seconds")
+        logger.info(f"Time taken: {monotonic() - start_time:.2f} seconds")
         self.assertTrue(chunk_count > 0, "No chunks were received")
         self.assertTrue(len(full_response) > 0, "No content was received")
 
@@ -376,27 +386,30 @@ class TestMiniMaxAPI(unittest.TestCase):
         self.assertEqual(delete_response['base_resp']['status_code'], 0)
         logger.info(f"Voice deleted successfully. Voice ID: {voice_id}")
 
-    @patch.object(OneSDK, 'generate')
-    def test_error_handling_generate(self, mock_generate):
-        mock_generate.side_effect = InvokeError("Test error")
+    def _raise_on_generate(self, exc):
+        """让 generate 直接抛出给定异常，避免构建 MagicMock 的开销。"""
+        def fail(*args, **kwargs):
+            raise exc
+        self.sdk.generate = fail
+        self.addCleanup(self.sdk.__dict__.pop, 'generate', None)
+
+    def test_error_handling_generate(self):
+        self._raise_on_generate(InvokeError("Test error"))
         with self.assertRaises(InvokeError):
             self.sdk.generate(self.default_model, [{"role": "user", "content": "Test"}])
 
-    @patch.object(OneSDK, 'generate')
-    def test_connection_error(self, mock_generate):
-        mock_generate.side_effect = InvokeConnectionError("Connection error")
+    def test_connection_error(self):
+        self._raise_on_generate(InvokeConnectionError("Connection error"))
         with self.assertRaises(InvokeConnectionError):
             self.sdk.generate(self.default_model, [{"role": "user", "content": "Test"}])
 
-    @patch.object(OneSDK, 'generate')
-    def test_rate_limit_error(self, mock_generate):
-        mock_generate.side_effect = InvokeRateLimitError("Rate limit exceeded")
+    def test_rate_limit_error(self):
+        self._raise_on_generate(InvokeRateLimitError("Rate limit exceeded"))
         with self.assertRaises(InvokeRateLimitError):
             self.sdk.generate(self.default_model, [{"role": "user", "content": "Test"}])
 
-    @patch.object(OneSDK, 'generate')
-    def test_authorization_error(self, mock_generate):
-        mock_generate.side_effect = InvokeAuthorizationError("Invalid API key")
+    def test_authorization_error(self):
+        self._raise_on_generate(InvokeAuthorizationError("Invalid API key"))
         with self.assertRaises(InvokeAuthorizationError):
             self.sdk.generate(self.default_model, [{"role": "user", "content": "Test"}])
 
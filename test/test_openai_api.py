@@ -3,7 +3,6 @@ import sys
 import unittest
 from typing import List, Dict
 import time
-from unittest.mock import patch
 
 # 添加项目根目录到 Python 路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -28,6 +27,14 @@ class TestOpenAIAPI(unittest.TestCase):
 
         cls.default_model = "gpt-3.5-turbo"
 
+        # 各用例共用同一消息对象，避免重复构造字典字面量
+        cls.count_messages = [{"role": "user", "content": "Count from 1 to 5."}]
+
+    @classmethod
+    def tearDownClass(cls):
+        # 释放连接池中的套接字
+        cls.sdk.api.session.close()
+
     def setUp(self):
         time.sleep(1)  # 添加延迟以避免频率限制
 
@@ -47,7 +54,7 @@ class TestOpenAIAPI(unittest.TestCase):
 
     def test_generate(self):
         logger.info("\nTesting generate for OpenAI:")
-        messages = [{"role": "user", "content": "Count from 1 to 5."}]
+        messages = self.count_messages
         response = self.sdk.generate(self.default_model, messages, max_tokens=100)
         self.assertIsInstance(response, Dict)
         self.assertIn('choices', response)
@@ -55,26 +62,28 @@ class TestOpenAIAPI(unittest.TestCase):
 
     def test_stream_generate(self):
         logger.info("\nTesting stream_generate for OpenAI:")
-        messages = [{"role": "user", "content": "Count from 1 to 5."}]
+        messages = self.count_messages
         stream = self.sdk.stream_generate(model=self.default_model, messages=messages, max_tokens=100)
-        full_response = ""
+        parts = []
         chunk_count = 0
-        start_time = time.time()
-        timeout = 30  # 30 seconds timeout
+        monotonic = time.monotonic  # 局部变量，避免每个 chunk 做属性查找
+        start_time = monotonic()
+        deadline = start_time + 30  # 30 seconds timeout
         for chunk in stream:
-            if time.time() - start_time > timeout:
+            if monotonic() > deadline:
                 logger.warning("Timeout reached for OpenAI")
                 break
             chunk_count += 1
             self.assertIsInstance(chunk, Dict)
-            logger.info(f"Received chunk {chunk_count}: {chunk}")
+            logger.info("Received chunk %d: %s", chunk_count, chunk)
             content = chunk.get('choices', [{}])[0].get('delta', {}).get('content', '')
             if content:
-                full_response += content
-                logger.info(f"Content: {content}")
+                parts.append(content)
+                logger.info("Content: %s", content)
+        full_response = "".join(parts)  # 一次性拼接，避免二次方的字符串增长
         logger.info(f"\nOpenAI full response: {full_response}")
         logger.info(f"Total chunks received: {chunk_count}")
-        logger.info(f"Time taken: {time.time() - start_time:.2f} seconds")
+        logger.info(f"Time taken: {monotonic() - start_time:.2f} seconds")
         self.assertTrue(chunk_count > 0, "No chunks were received")
         self.assertTrue(len(full_response) > 0, "No content was received")
 
@@ -111,27 +120,30 @@ class TestOpenAIAPI(unittest.TestCase):
         self.assertIsInstance(files, List)
         logger.info(f"OpenAI files: {files}")
 
-    @patch.object(OneSDK, 'generate')
-    def test_error_handling_generate(self, mock_generate):
-        mock_generate.side_effect = InvokeError("Test error")
+    def _raise_on_generate(self, exc):
+        """让 generate 直接抛出给定异常，避免构建 MagicMock 的开销。"""
+        def fail(*args, **kwargs):
+            raise exc
+        self.sdk.generate = fail
+        self.addCleanup(self.sdk.__dict__.pop, 'generate', None)
+
+    def test_error_handling_generate(self):
+        self._raise_on_generate(InvokeError("Test error"))
         with self.assertRaises(InvokeError):
             self.sdk.generate(self.default_model, [{"role": "user", "content": "Test"}])
 
-    @patch.object(OneSDK, 'generate')
-    def test_connection_error(self, mock_generate):
-        mock_generate.side_effect = InvokeConnectionError("Connection error")
+    def test_connection_error(self):
+        self._raise_on_generate(InvokeConnectionError("Connection error"))
         with self.assertRaises(InvokeConnectionError):
             self.sdk.generate(self.default_model, [{"role": "user", "content": "Test"}])
 
-    @patch.object(OneSDK, 'generate')
-    def test_rate_limit_error(self, mock_generate):
-        mock_generate.side_effect = InvokeRateLimitError("Rate limit exceeded")
+    def test_rate_limit_error(self):
+        self._raise_on_generate(InvokeRateLimitError("Rate limit exceeded"))
         with self.assertRaises(InvokeRateLimitError):
             self.sdk.generate(self.default_model, [{"role": "user", "content": "Test"}])
 
-    @patch.object(OneSDK, 'generate')
-    def test_authorization_error(self, mock_generate):
-        mock_generate.side_effect = InvokeAuthorizationError("Invalid API key")
+    def test_authorization_error(self):
+        self._raise_on_generate(InvokeAuthorizationError("Invalid API key"))
         with self.assertRaises(InvokeAuthorizationError):
             self.sdk.generate(self.default_model, [{"role": "user", "content": "Test"}])
 
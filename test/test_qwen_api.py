@@ -3,7 +3,6 @@ import sys
 import unittest
 from typing import Dict
 import time
-from unittest.mock import patch
 
 # 添加项目根目录到 Python 路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -27,6 +26,11 @@ class TestQwenAPI(unittest.TestCase):
 
         cls.default_model = "qwen-turbo"
 
+    @classmethod
+    def tearDownClass(cls):
+        # 释放连接池中的套接字
+        cls.sdk.api.session.close()
+
     def test_count_tokens(self):
         logger.info("\nTesting count_tokens for Qwen:")
         messages = [
@@ -61,12 +65,13 @@ class TestQwenAPI(unittest.TestCase):
         logger.info("\nTesting stream_generate for Qwen:")
         messages = [{"role": "user", "content": "Count from 1 to 5."}]
         stream = self.sdk.stream_generate(model=self.default_model, messages=messages)
-        full_response = ""
+        parts = []
         chunk_count = 0
-        start_time = time.time()
-        timeout = 30  # 30 seconds timeout
+        monotonic = time.monotonic  # 局部变量，避免每个 chunk 做属性查找
+        start_time = monotonic()
+        deadline = start_time + 30  # 30 seconds timeout
         for chunk in stream:
-            if time.time() - start_time > timeout:
+            if monotonic() > deadline:
                 logger.warning("Timeout reached for Qwen")
                 break
             chunk_count += 1
@@ -75,11 +80,12 @@ class TestQwenAPI(unittest.TestCase):
             self.assertIn('message', chunk['choices'][0])
             content = chunk['choices'][0]['message'].get('content', '')
             if content:
-                full_response += content
-                logger.info(f"Qwen chunk {chunk_count}: {content}")
+                parts.append(content)
+                logger.info("Qwen chunk %d: %s", chunk_count, content)
+        full_response = "".join(parts)  # 一次性拼接，避免二次方的字符串增长
         logger.info(f"\nQwen full response: {full_response}")
         logger.info(f"Total chunks received: {chunk_count}")
-        logger.info(f"Time taken: {time.time() - start_time:.2f} seconds")
+        logger.info(f"Time taken: {monotonic() - start_time:.2f} seconds")
 
     def test_set_model(self):
         logger.info("\nTesting set_model for Qwen:")
@@ -87,9 +93,15 @@ class TestQwenAPI(unittest.TestCase):
         self.assertEqual(sdk_with_model.current_model, self.default_model)
         logger.info(f"Qwen model set successfully: {self.default_model}")
 
-    @patch.object(OneSDK, 'generate')
-    def test_error_handling(self, mock_generate):
-        mock_generate.side_effect = InvokeError("Test error")
+    def _raise_on_generate(self, exc):
+        """让 generate 直接抛出给定异常，避免构建 MagicMock 的开销。"""
+        def fail(*args, **kwargs):
+            raise exc
+        self.sdk.generate = fail
+        self.addCleanup(self.sdk.__dict__.pop, 'generate', None)
+
+    def test_error_handling(self):
+        self._raise_on_generate(InvokeError("Test error"))
         with self.assertRaises(InvokeError):
             self.sdk.generate(self.default_model, [{"role": "user", "content": "Test"}])
 